@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Benchmarks: run with "python3 benchmarks/benchmark.py [section ...]"
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import json, statistics, subprocess, sys, time, tracemalloc
+from pathlib import Path
+
+_src = str(Path(__file__).resolve().parent.parent / 'src')
+sys.path.insert(0, _src)
+
+
+# startup: a fresh process for each operation (import, init and first call, with the peak traced memory)
+
+_operations = (
+    ('list_scriptures', {}, ('Joh 3:16; Gen 1:1-3',)),
+    ('tag_scriptures', {}, ('Joh 3:16; Gen 1:1-3',)),
+    ('rewrite_scriptures', {'translate': 'German'}, ('Joh 3:16; Gen 1:1-3',)),
+    ('code_scriptures', {}, ('Joh 3:16; Gen 1:1-3',)),
+    ('decode_scriptures', {}, ([('43003016', '43003016'), ('01001001', '01001003')],)),
+)
+
+def _child(method, kwargs, args): # (run in the fresh process)
+    start = time.perf_counter()
+    from linkture import Scriptures
+    tracemalloc.start()
+    imported = time.perf_counter()
+    s = Scriptures(**kwargs)
+    initialized = time.perf_counter()
+    getattr(s, method)(*args)
+    called = time.perf_counter()
+    print(json.dumps([imported - start, initialized - imported, called - initialized, tracemalloc.get_traced_memory()[1]]))
+
+def startup(runs=5):
+    print(f'{"operation":<22}{"import":>10}{"init":>10}{"1st call":>10}{"peak":>10}   (median of {runs} fresh processes)')
+    for method, kwargs, args in _operations:
+        results = []
+        for _ in range(runs):
+            code = f'import sys; sys.path.insert(0, {str(Path(__file__).resolve().parent)!r}); from benchmark import _child; _child({method!r}, {kwargs!r}, {args!r})'
+            output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(output.splitlines()[-1]))
+        imported, initialized, called, peak = (statistics.median(column) for column in zip(*results))
+        print(f'{method:<22}{imported*1000:>8.1f}ms{initialized*1000:>8.2f}ms{called*1000:>8.1f}ms{peak/1024:>8.0f}KB')
+
+
+# fuzzy: exact vs fuzzy book names (index build, then texts with exact, misspelled and unknown names)
+
+_texts = {
+    'exact names': 'Matthew 5:3; Revelation 21:4; Philippians 4:13; Genesis 1:1. ',
+    'misspelled': 'Mathew 5:3; Revalation 21:4; Philipians 4:13; Gensis 1:1. ',
+    'unknown names': 'Paul 3:16; Chapter 2:1; Version 1:4; Verses 4:13. ',
+}
+
+def _best(function, runs=5):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+def fuzzy(repeat=250):
+    from linkture import Scriptures
+    modes = (('exact', 0), ('fuzzy=1', 1), ('fuzzy=2', 2))
+    print(f'{"":<16}' + ''.join(f'{mode:>14}' for mode, _ in modes) + f'   (ms per {4*repeat} references, best of 5)')
+    instances = []
+    line = f'{"index build":<16}'
+    for mode, distance in modes:
+        s = Scriptures(fuzzy=distance)
+        s.code_scriptures('Genesis 1:1') # (names, tables and patterns)
+        if distance:
+            start = time.perf_counter()
+            s._fuzzy_index.lookup('GENSIS')
+            line += f'{(time.perf_counter() - start)*1000:>12.2f}ms'
+        else:
+            line += f'{"-":>14}'
+        instances.append(s)
+    print(line)
+    for name, text in _texts.items():
+        text = text * repeat
+        line = f'{name:<16}'
+        for s in instances:
+
+            def run():
+                s._encoded = {} # (not cached from the previous run)
+                s.code_scriptures(text)
+
+            line += f'{_best(run)*1000:>12.2f}ms'
+        print(line)
+
+
+sections = {'startup': startup, 'fuzzy': fuzzy}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or sections:
+        print(f'\n== {name}')
+        sections[name]()
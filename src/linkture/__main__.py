@@ -26,32 +26,136 @@
   SOFTWARE.
 """
 
-import argparse, sys
+import argparse, contextlib, io, sys, time
+from .epub import process_epub
 from .linkture import _available_languages, __app__, __version__, Scriptures
-from ast import literal_eval
+from .parallel import process_parallel
+from .stats import levels, CitationStats
+from .streams import input_formats, output_formats, code_fields, decode_fields, list_fields, stats_fields, read_ranges, Writer
+from pathlib import Path
+from types import SimpleNamespace
 
 
 def main(args):
 
-    def switchboard(text):
+    def conversion():
         if args['l'] is not None:
             tags = args['l']
             prefix = tags[0] if len(tags) > 0 and tags[0] != '' else '<a href="'
             suffix = tags[1] if len(tags) > 1 and tags[1] != '' else '">'
-            return s.link_scriptures(text, prefix, suffix)
-        elif args['c']:
-            return s.code_scriptures(text, split=args['chapters'])
-        elif args['d']:
-            return s.decode_scriptures(literal_eval(text))
-        elif args['x']:
-            return s.list_scriptures(text)
+            return 'link_scriptures', (prefix, suffix)
         elif args['t'] is not None:
             tags = args['t']
             start_tag = tags[0] if len(tags) > 0 else '{{'
             end_tag = tags[1] if len(tags) > 1 else '}}'
-            return s.tag_scriptures(text, start_tag, end_tag)
+            return 'tag_scriptures', (start_tag, end_tag)
         else:
-            return s.rewrite_scriptures(text)
+            return 'rewrite_scriptures', ()
+
+    def switchboard(text):
+        method, params = conversion()
+        if args['w'] and args['f'] and not args['html']: # in segments (of whole lines)
+            return process_parallel(s, text, method, params, args['w'])
+        return getattr(s, method)(text, *params, html=args['html'])
+
+    def records(): # -c, -d, -x and --stats: each record is written as soon as it's found
+        ranges = args['d'] or (args['stats'] and args['in_format']) # BCV-range input
+        in_format = args['in_format'] or 'repr'
+        if args['o']:
+            out = open(args['o'], 'w', encoding='UTF-8', newline='', buffering=1048576)
+            reports = contextlib.nullcontext()
+        else:
+            stdout = sys.stdout
+            out = SimpleNamespace(write=lambda t: stdout.write(t.replace('\\xa0', '\xa0')), flush=stdout.flush)
+            reports = contextlib.redirect_stdout(sys.stderr) # error reports: not within the records
+        if args['c']:
+            fields = code_fields
+        elif args['d']:
+            fields = decode_fields
+        elif args['stats']:
+            fields = stats_fields
+        else:
+            fields = list_fields
+        if ranges and (in_format == 'bin') and not args['f']:
+            print('Binary BCV ranges can only be read from a file!\n')
+            exit()
+        writer = Writer(out, args['format'], fields)
+        if ranges and (in_format == 'bin'):
+            src = open(args['f'], 'rb')
+        elif args['f']:
+            src = open(args['f'], 'r', encoding='UTF-8', newline='' if ranges else None)
+        else:
+            src = io.StringIO(args['r']) if ranges else args['r']
+        try:
+            with reports:
+                if args['w'] and args['f'] and (args['c'] or args['x']):
+                    if args['c']:
+                        process_parallel(s, src, 'code_scriptures', (args['chapters'],), args['w'], callback=writer)
+                    else:
+                        process_parallel(s, src, 'list_scriptures', (), args['w'], callback=writer)
+                elif args['c']:
+                    s.code_scriptures(src, split=args['chapters'], callback=writer)
+                elif args['d']: # streamed: decoded as read, book by book
+                    s.decode_scriptures(read_ranges(src, in_format), callback=writer)
+                elif args['stats']:
+                    stats = CitationStats(s)
+                    if ranges:
+                        stats.add_ranges(read_ranges(src, in_format))
+                    else:
+                        stats.add_document(src)
+                    stats.top(args['stats'], callback=writer)
+                else:
+                    s.list_scriptures(src, callback=writer)
+        finally:
+            writer.close()
+            if args['f']:
+                src.close()
+            if args['o']:
+                out.close()
+            elif args['format'] == 'repr':
+                print()
+
+    def epub():
+        if not args['o'] or (args['o'] == args['epub']):
+            print('Provide an out-file different from the in-file!\n')
+            exit()
+        if args['c'] or args['d'] or args['x'] or args['stats']:
+            print('EPUB archives can only be linked, tagged or rewritten!\n')
+            exit()
+        method, params = conversion()
+        report = None if args['q'] else lambda name, seconds: print(f'{seconds:8.3f}s  {name}')
+        start = time.perf_counter()
+        process_epub(s, args['epub'], args['o'], method, params, args['w'], report)
+        if report:
+            print(f'{time.perf_counter() - start:8.3f}s  TOTAL')
+
+    def translations(): # several --translate languages: located once and rewritten (or linked) into each
+        if args['epub'] or args['html'] or args['c'] or args['d'] or args['x'] or args['stats'] or (args['t'] is not None) or args['cc'] or args['cv'] or args['sv'] or args['sc'] or args['bn']:
+            print('Multiple translation languages only for rewriting or linking (not with --epub or --html)!\n')
+            exit()
+        if args['f']:
+            with open(args['f'], 'r', encoding='UTF-8') as f:
+                txt = f.read()
+        else:
+            txt = args['r']
+        if not txt:
+            print(parser.format_help())
+            exit()
+        prefix, suffix = None, '>'
+        if args['l'] is not None:
+            _, (prefix, suffix) = conversion()
+        for language, txt in s.translate_many(txt, targets, form, prefix, suffix).items():
+            if args['o']:
+                out = Path(args['o'])
+                out = out.with_name(f'{out.stem}.{language}{out.suffix}') # out.txt -> out.German.txt, etc.
+                if args['f'] and out.resolve() == Path(args['f']).resolve():
+                    print('Make sure in-file and out-file are different!\n')
+                    exit()
+                with open(out, 'w', encoding='UTF-8') as f:
+                    f.write(txt)
+            else:
+                print(f'[{language}]')
+                print(txt.replace('\\xa0', '\xa0'))
 
     form = None
     if args['standard']:
@@ -61,12 +165,26 @@ def main(args):
     elif args['full']:
         form = 'full'
 
-    s = Scriptures(language=args['language'], translate=args['translate'], form=form, separator=args['s'], upper=args['u'], verbose=(not args['q']))
+    targets = args['translate'] or []
+    s = Scriptures(language=args['language'], translate=targets[0] if targets else None, form=form, separator=args['s'], upper=args['u'], verbose=(not args['q']), timeout=args['timeout'], fuzzy=args['fuzzy'])
+
+    if len(targets) > 1:
+        translations()
+        return
+
+    if args['epub']:
+        epub()
+        return
+
+    if args['f'] and args['o'] and (args['o'] == args['f']):
+        print('Make sure in-file and out-file are different!\n')
+        exit()
+
+    if (args['c'] or args['d'] or args['x'] or args['stats']) and (args['f'] or args['r']) and not (args['cc'] or args['cv'] or args['sv'] or args['sc'] or args['bn']):
+        records()
+        return
 
     if args['f']:
-        if args['o'] and (args['o'] == args['f']):
-            print('Make sure in-file and out-file are different!\n')
-            exit()
         with open(args['f'], 'r', encoding='UTF-8') as f:
             txt = f.read()
     else:
@@ -104,12 +222,16 @@ function_group = parser.add_argument_group('data source (one required - except f
 mode = function_group.add_mutually_exclusive_group()
 mode.add_argument('-f', metavar='in-file', help='get input from file (UTF-8)')
 mode.add_argument('-r', metavar='reference', help='process "reference; reference; etc."')
+mode.add_argument('--epub', metavar='in-file', help='process the (X)HTML documents of an EPUB archive (requires -o; only with -l, -t or rewrite)')
 parser.add_argument('-o', metavar='out-file', help='output file (terminal output if not provided)')
+parser.add_argument('-w', metavar='workers', type=int, help='number of worker processes (number of CPUs if not provided); with -f, the in-file is processed in segments by as many workers (not with -d, --stats or --html)')
 
 parser.add_argument('--language', default='English', choices=_available_languages, help='indicate source language for book names (English if unspecified)')
-parser.add_argument('--translate', choices=_available_languages, help='indicate output language for book names (same as source if unspecified)')
+parser.add_argument('--translate', nargs='+', metavar='language', choices=_available_languages, help='indicate output language(s) for book names (same as source if unspecified); with several, the output is labelled by language (or written to out-file.language)')
 parser.add_argument('-s', metavar='separator', default=' ', help='segment separator (space by default)')
 parser.add_argument('-u', action='store_true', help='capitalize (upper-case) book names')
+parser.add_argument('--fuzzy', metavar='distance', nargs='?', type=int, const=1, default=0, help='also recognize misspelled book names (within "distance" edits; 1 if not provided)')
+parser.add_argument('--timeout', metavar='seconds', type=float, help='maximum time for locating the scriptures (no limit if not provided)')
 format_group = parser.add_argument_group('output format (optional)', 'if provided, book names will be rewritten accordingly:')
 formats = format_group.add_mutually_exclusive_group()
 formats.add_argument('--full', action='store_true', help='output as full name - default (eg., "Genesis")')
@@ -117,6 +239,9 @@ formats.add_argument('--official', action='store_true', help='output as official
 formats.add_argument('--standard', action='store_true', help='output as standard abbreviation (eg., "Gen.")')
 parser.add_argument('--chapters', action='store_true', 
                     help='encode multi-chapter ranges into separate chapters (only with -c)')
+parser.add_argument('--format', default='repr', choices=output_formats, help='output format of -c, -d, -x and --stats records (Python list by default)')
+parser.add_argument('--in-format', choices=input_formats, help='input format of -d BCV ranges (Python list by default; "bin": pairs of little-endian uint32); with --stats, the input is BCV ranges instead of text')
+parser.add_argument('--html', action='store_true', help='HTML input: process only text nodes, skipping existing links, scripts, etc. (not with -c, -d or -x)')
 
 type_group = parser.add_argument_group('type of conversion', 'if not specified, references are simply rewritten according to chosen output format:')
 tpe = type_group.add_mutually_exclusive_group(required=False)
@@ -125,6 +250,7 @@ tpe.add_argument('-d', action='store_true', help='decode list of BCV-notation ra
 tpe.add_argument('-l', nargs='*', metavar=('prefix', 'suffix'), help='create <a></a> links; provide a "prefix" and a "suffix" (or neither for testing)')
 tpe.add_argument('-t', nargs='*', metavar=('start', 'end'), help='tag scriptures (provide optional start and end tags; default "{{" "}}")')
 tpe.add_argument('-x', action='store_true', help='extract list of scripture references')
+tpe.add_argument('--stats', choices=levels, help='count the citations of each book, chapter or verse (most cited first)')
 
 aux_group = parser.add_argument_group('auxiliary functions')
 aux = aux_group.add_mutually_exclusive_group(required=False)
@@ -138,6 +264,9 @@ def main_cli():
     try:
         args = parser.parse_args()
         main(vars(args))
+    except TimeoutError:
+        print('Time limit exceeded while locating scriptures! (see --timeout)\n')
+        sys.exit(1)
     except Exception as e:
         print('\n' + '='*36)
         print('ERROR: An unexpected error occurred!')
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Process the (X)HTML documents of an EPUB (or any ZIP) archive in parallel
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import codecs, copy, regex, time, zipfile
+from .parallel import run_jobs
+
+
+_documents = ('.xhtml', '.html', '.htm')
+_boms = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'))
+_declaration = regex.compile(rb'<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._-]+)["\']')
+
+
+def _encoding(data):
+    # (BOM, encoding) of a document: from its BOM or XML declaration (UTF-8 if neither)
+    for bom, encoding in _boms:
+        if data.startswith(bom):
+            return bom, encoding
+    if data.startswith(b'<\x00?\x00'):
+        return b'', 'utf-16-le'
+    if data.startswith(b'\x00<\x00?'):
+        return b'', 'utf-16-be'
+    match = _declaration.match(data)
+    if match:
+        try:
+            encoding = codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            encoding = None
+        if encoding and not encoding.startswith(('utf-16', 'utf-32')): # (can't be: the declaration was read as ASCII)
+            return b'', encoding
+    return b'', 'utf-8'
+
+def _process(s, job):
+    name, data, method, args = job
+    start = time.perf_counter()
+    bom, encoding = _encoding(data)
+    text = getattr(s, method)(data[len(bom):].decode(encoding), *args, html=True)
+    return name, bom + text.encode(encoding, 'xmlcharrefreplace'), time.perf_counter() - start # (same encoding as the original)
+
+
+def process_epub(s, in_path, out_path, method='link_scriptures', args=(), workers=None, report=None):
+    # "method": link_scriptures, tag_scriptures or rewrite_scriptures (with its "args")
+    # "report": called with (member name, seconds) for each processed document
+    # documents are read (and written) as they are processed, with only a few pending at a time
+    with zipfile.ZipFile(in_path) as zin, zipfile.ZipFile(out_path, 'w') as zout:
+        infos = zin.infolist()
+        jobs = ((info.filename, zin.read(info), method, args) for info in infos if info.filename.lower().endswith(_documents))
+        results = run_jobs(s, _process, jobs, workers)
+        try:
+            for info in infos:
+                if info.filename.lower().endswith(_documents):
+                    name, data, seconds = next(results)
+                    if report:
+                        report(name, seconds)
+                else:
+                    data = zin.read(info)
+                zout.writestr(copy.copy(info), data) # same order, compression and attributes
+        finally:
+            results.close()
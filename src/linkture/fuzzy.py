@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Near-miss (typo-tolerant) lookup of book names
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+# SymSpell-style deletion index: all the variants of each name with up to "distance" characters deleted
+# are indexed, so a near miss is found by looking up the variants of the query (instead of comparing it
+# with every name); the candidates are then checked with the actual edit distance
+
+def _deletes(word, distance):
+    variants = {word}
+    edge = {word}
+    for _ in range(distance):
+        edge = {w[:i] + w[i+1:] for w in edge for i in range(len(w))}
+        variants |= edge
+    return variants
+
+def _distance(a, b, limit):
+    # optimal string alignment distance (adjacent transposition is one edit); limit + 1 if beyond limit
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j-1] + 1, previous[j-1] + (a[i-1] != b[j-1]))
+            if i > 1 and j > 1 and a[i-1] == b[j-2] and a[i-2] == b[j-1]:
+                current[j] = min(current[j], previous2[j-2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class DeletionIndex():
+
+    def __init__(self, names, distance=1):
+        # names: {name: value}
+        if distance < 1:
+            raise ValueError('Indicated distance is not an option!')
+        self._names = names
+        self._distance = distance
+        self._deletes = {}
+        for name in names:
+            for variant in _deletes(name, distance):
+                self._deletes.setdefault(variant, set()).add(name)
+        self._found = {}
+
+    def lookup(self, query):
+        # value of the closest name(s), or None if there's none within the distance or they disagree (ambiguous)
+        # - names only differing by their ending are not matched (e.g., "NUMBER" vs. "NUMBERS", "MARKS" vs. "MARK")
+        # - a match at distance d needs a query of at least 3 * d + 3 characters (short names are too alike)
+        if query in self._found:
+            return self._found[query]
+        value = None
+        distance = min(self._distance, (len(query) - 3) // 3)
+        if distance > 0:
+            best = distance + 1
+            values = set()
+            candidates = set()
+            for variant in _deletes(query, distance):
+                candidates.update(self._deletes.get(variant, ()))
+            for name in candidates:
+                if name.startswith(query) or query.startswith(name):
+                    continue
+                d = _distance(query, name, distance)
+                if d > distance: # (variants of both within the distance don't make the names close enough)
+                    continue
+                if d < best:
+                    best = d
+                    values = {self._names[name]}
+                elif d == best:
+                    values.add(self._names[name])
+            if len(values) == 1:
+                value = values.pop()
+        if len(self._found) > 100000: # bounded memo of the lookups
+            self._found.clear()
+        self._found[query] = value
+        return value
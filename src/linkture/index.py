@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Inverted verse index over a corpus of documents
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import sqlite3
+from .linkture import Scriptures
+
+
+class CitationIndex():
+
+    def __init__(self, path=':memory:', scriptures=None, **kwargs):
+        try:
+            self._s = scriptures or Scriptures(**kwargs)
+            self._con = sqlite3.connect(path)
+            cur = self._con.cursor()
+            cur.execute('CREATE TABLE IF NOT EXISTS Documents (DocKey INTEGER PRIMARY KEY, DocId TEXT NOT NULL UNIQUE);')
+            cur.execute('CREATE TABLE IF NOT EXISTS CitationDocs (Id INTEGER PRIMARY KEY, DocKey INTEGER NOT NULL);')
+            cur.execute('CREATE INDEX IF NOT EXISTS CitationDocsKey ON CitationDocs (DocKey);')
+            try: # 1-dimensional R*Tree over serial verse numbers
+                cur.execute('CREATE VIRTUAL TABLE IF NOT EXISTS Citations USING rtree_i32(Id, First, "Last");')
+                self._span = None
+            except sqlite3.OperationalError: # SQLite built without R*Tree: sorted intervals instead
+                cur.execute('CREATE TABLE IF NOT EXISTS Citations (Id INTEGER PRIMARY KEY, First INTEGER NOT NULL, "Last" INTEGER NOT NULL);')
+                cur.execute('CREATE INDEX IF NOT EXISTS CitationsFirst ON Citations (First, "Last");')
+                self._span = cur.execute('SELECT max("Last" - First) FROM Citations;').fetchone()[0] or 0 # longest interval: bounds the scan
+            # number of citations of each verse (kept up to date), for top_verses
+            cur.execute('CREATE TABLE IF NOT EXISTS VerseCounts (Serial INTEGER PRIMARY KEY, Book INTEGER NOT NULL, Count INTEGER NOT NULL);')
+            cur.execute('CREATE INDEX IF NOT EXISTS VerseCountsBook ON VerseCounts (Book, Count DESC, Serial);')
+            if not cur.execute('SELECT 1 FROM VerseCounts LIMIT 1;').fetchone(): # new (or older) index file
+                verses_id = self._s._verses_id
+                cur.executemany('INSERT INTO VerseCounts VALUES (?, ?, 0);', ((i + 1, verses_id[i][0]) for i in range(len(verses_id))))
+                cur.executemany('UPDATE VerseCounts SET Count = Count + 1 WHERE Serial BETWEEN ? AND ?;', cur.execute('SELECT First, "Last" FROM Citations;').fetchall())
+            self._con.commit()
+            cur.close()
+        except Exception as e:
+            raise RuntimeError(f'Failed to initialize CitationIndex: {str(e)}\n') from e
+
+    def _serials(self, bcv_ranges):
+        for start, end in bcv_ranges:
+            ss = self._s.serial_verse_number(start)
+            es = self._s.serial_verse_number(end)
+            if ss is None or es is None:
+                continue
+            if ss > es:
+                ss, es = es, ss
+            yield ss, es
+
+    def _intervals(self, reference):
+        if isinstance(reference, str):
+            return list(self._serials(self._s.code_scriptures(reference)))
+        if reference and isinstance(reference[0], str): # single (start, end) range
+            reference = [reference]
+        return list(self._serials(reference))
+
+    def _book_interval(self, book):
+        book = int(book)
+        last = self._s._ranges.get((book, 0))
+        if not last:
+            return None, None
+        first = self._s.serial_verse_number(f'{book:02d}001001')
+        last = self._s.serial_verse_number(f'{book:02d}{last:03d}{self._s._ranges.get((book, last)):03d}')
+        return first, last
+
+
+    def add_document(self, doc_id, text):
+        return self.add_ranges(doc_id, self._s.code_scriptures(text))
+
+    def add_ranges(self, doc_id, bcv_ranges):
+        self.remove_document(doc_id, commit=False)
+        cur = self._con.cursor()
+        cur.execute('INSERT INTO Documents (DocId) VALUES (?);', (doc_id,))
+        key = cur.lastrowid
+        count = 0
+        for ss, es in self._serials(bcv_ranges):
+            cur.execute('INSERT INTO CitationDocs (DocKey) VALUES (?);', (key,))
+            cur.execute('INSERT INTO Citations (Id, First, "Last") VALUES (?, ?, ?);', (cur.lastrowid, ss, es))
+            cur.execute('UPDATE VerseCounts SET Count = Count + 1 WHERE Serial BETWEEN ? AND ?;', (ss, es))
+            if self._span is not None:
+                self._span = max(self._span, es - ss)
+            count += 1
+        self._con.commit()
+        cur.close()
+        return count
+
+    def remove_document(self, doc_id, commit=True):
+        cur = self._con.cursor()
+        row = cur.execute('SELECT DocKey FROM Documents WHERE DocId = ?;', (doc_id,)).fetchone()
+        if row:
+            intervals = cur.execute('SELECT First, "Last" FROM Citations WHERE Id IN (SELECT Id FROM CitationDocs WHERE DocKey = ?);', row).fetchall()
+            cur.executemany('UPDATE VerseCounts SET Count = Count - 1 WHERE Serial BETWEEN ? AND ?;', intervals)
+            cur.execute('DELETE FROM Citations WHERE Id IN (SELECT Id FROM CitationDocs WHERE DocKey = ?);', row)
+            cur.execute('DELETE FROM CitationDocs WHERE DocKey = ?;', row)
+            cur.execute('DELETE FROM Documents WHERE DocKey = ?;', row)
+        if commit:
+            self._con.commit()
+        cur.close()
+        return bool(row)
+
+    def documents(self, reference):
+        # reference: "Gen 1:1-5; 3:2" or BCV range(s) - returns ids of documents citing any verse in it
+        result = []
+        seen = set()
+        cur = self._con.cursor()
+        for ss, es in self._intervals(reference):
+            low = 0 if self._span is None else ss - self._span # (intervals starting before can't reach ss)
+            for doc_id, in cur.execute('SELECT DISTINCT d.DocId FROM Citations c JOIN CitationDocs m USING (Id) JOIN Documents d USING (DocKey) WHERE c.First <= ? AND c."Last" >= ? AND c.First >= ?;', (es, ss, low)):
+                if doc_id not in seen:
+                    seen.add(doc_id)
+                    result.append(doc_id)
+        cur.close()
+        return result
+
+    def top_verses(self, book, limit=10):
+        # most-cited verses in book number "book" (1-66): list of (BCV, count)
+        first, last = self._book_interval(book)
+        if not first:
+            self._s._error_report(book, 'OUT OF RANGE')
+            return []
+        cur = self._con.cursor()
+        verses = cur.execute('SELECT Serial, Count FROM VerseCounts WHERE Book = ? AND Count > 0 ORDER BY Count DESC, Serial LIMIT ?;', (int(book), -1 if limit is None else limit)).fetchall()
+        cur.close()
+        result = []
+        for serial, count in verses:
+            bk, ch, vs = self._s._verses_id[serial - 1]
+            result.append((f'{bk:02d}{ch:03d}{vs:03d}', count))
+        return result
+
+    def close(self):
+        self._con.close()
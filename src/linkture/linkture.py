@@ -30,21 +30,34 @@ __app__ = 'linkture'
 __version__ = 'v5.2.0'
 
 
-import json, regex, sqlite3
+import json, regex, sqlite3, time
+from bisect import bisect_left
+from functools import cached_property
+from itertools import chain
 from pathlib import Path
 from unidecode import unidecode
+from .fuzzy import DeletionIndex
+from .tables import load_tables
 
 
 _available_languages = ('Cebuano', 'Chinese', 'Danish', 'Dutch', 'English', 'Ewe', 'French', 'German', 'Greek', 'Haitian', 'Hungarian', 'Indonesian', 'Italian', 'Japanese', 'Korean', 'Norwegian', 'Polish', 'Portuguese', 'Romanian', 'Russian', 'Spanish', 'Swedish', 'Tagalog', 'Ukrainian')
 _non_latin = ('Chinese', 'Greek', 'Japanese', 'Korean', 'Russian', 'Ukrainian')
+_forms = {'full': 3, 'standard': 4, 'official': 5} # column of the name in the Books table
+_punctuation = regex.compile(r'\p{P}|\p{Z}')
+_shared = {} # book names and verse/chapter tables (if not memory-mapped) of all instances
 
 
 class Scriptures():
 
-    def __init__(self, language='English', translate=None, form=None, separator=' ', upper=False, verbose=False):
+    def __init__(self, language='English', translate=None, form=None, separator=' ', upper=False, verbose=False, timeout=None, fuzzy=False):
         try:
+            self._config = dict(language=language, translate=translate, form=form, separator=separator, upper=upper, verbose=verbose, timeout=timeout, fuzzy=fuzzy) # to set up workers
             self._verbose = verbose
+            self._timeout = timeout
             self._separator = separator
+            self._fuzzy = int(fuzzy) # maximum edit distance of misspelled book names (True: 1)
+            if self._fuzzy < 0:
+                raise ValueError('Indicated fuzzy distance is not an option!')
             if language not in _available_languages:
                 raise ValueError('Indicated source language is not an option!')
             if translate:
@@ -58,110 +71,222 @@ class Scriptures():
                 self._nl = False
             self._rewrite = bool((language != translate) or form)
             self._upper = upper
-            if form == 'full':
-                form = 3
-            elif form == 'standard':
-                form = 4
-            elif form == 'official':
-                form = 5
-            else:
-                form = 3
+            self._form = _forms.get(form, 3)
 
-            path = Path(__file__).resolve().parent
-            con = sqlite3.connect(path / 'res/resources.db')
-            cur = con.cursor()
+            self._language = language
+            self._translate = translate
+            self._path = Path(__file__).resolve().parent
+            # book names, verse/chapter tables and patterns are loaded on first use (see below)
 
-            self._src_book_names = {}
-            self._tr_book_names = ['Bible']
-            for rec in cur.execute(f'SELECT * FROM Books WHERE Language = ?;', (translate,)).fetchall():
-                if self._upper:
-                    tr = rec[form].upper()
-                else:
-                    tr = rec[form]
-                self._tr_book_names.insert(rec[2], tr)
-            for rec in cur.execute(f'SELECT * FROM Books WHERE Language = ?;', (language,)).fetchall():
+            self._headings = (3, 4, 5, 6, 7, 8, 9, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 34, 35, 36, 37, 38, 39, 40, 41, 42, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63, 64, 65, 66, 67, 68, 69, 70, 72, 73, 74, 75, 76, 77, 78, 79, 80, 81, 82, 83, 84, 85, 86, 87, 88, 89, 90, 92, 98, 100, 101, 102, 103, 108, 109, 110, 120, 121, 122, 123, 124, 125, 126, 127, 128, 129, 130, 131, 132, 133, 134, 138, 139, 140, 141, 142, 143, 144, 145)
+            self._reported = []
+            self._messages = None # if a list, error reports are collected in it (see parallel.py) instead of shown
+            self._stage = 0
+            self._encoded = {}
+            self._linked = {}
+
+        except Exception as e:
+            raise RuntimeError(f'Failed to initialize Scriptures: {str(e)}\n') from e
+
+    def _normalize(self, bk_name):
+        if not self._nl:
+            bk_name = unidecode(bk_name) # NOTE: this converts Génesis to Genesis and English recognizes it !! Feature :-)
+        return _punctuation.sub('', bk_name.upper())
+
+    # book names and tables are loaded on first use (and shared by all instances)
+
+    @cached_property
+    def _src_book_names(self):
+        key = ('source', self._language)
+        if key not in _shared:
+            src_book_names = {}
+            con = sqlite3.connect(self._path / 'res/resources.db')
+            cur = con.cursor()
+            for rec in cur.execute(f'SELECT * FROM Books WHERE Language = ?;', (self._language,)).fetchall():
                 for i in range(3,6):
-                    item = rec[i]
-                    if not self._nl:
-                        item = unidecode(item)
-                    normalized = regex.sub(r'\p{P}|\p{Z}', '', item.upper())
-                    self._src_book_names[normalized] = rec[2]
+                    src_book_names[self._normalize(rec[i])] = rec[2]
+            cur.close()
+            con.close()
 
-            with open(path / 'res/custom.json', 'r', encoding='UTF-8') as json_file:
+            with open(self._path / 'res/custom.json', 'r', encoding='UTF-8') as json_file:
                 b = json.load(json_file)
-            if language in b.keys():
-                for row in b[language]:
+            if self._language in b.keys():
+                for row in b[self._language]:
                     names = row[1].split(', ')
                     for item in names:
-                        if not self._nl:
-                            item = unidecode(item)
-                        normalized = regex.sub(r'\p{P}|\p{Z}', '', item.upper())
-                        self._src_book_names[normalized] = row[0]
-
-            self._ranges = {}
-            for book, chapter, last in cur.execute('SELECT Book, Chapter, Last FROM Ranges;'):
-                self._ranges[(book, chapter)] = last
-
-            self._chapters = {}
-            self._chapters_id = {}
-            for chapter_id, book, chapter in cur.execute('SELECT ChapterId, Book, Chapter FROM Chapters;'):
-                self._chapters[(book, chapter)] = chapter_id
-                self._chapters_id[chapter_id] = (book, chapter)
-
-            self._verses = {}
-            self._verses_id = {}
-            for verse_id, book, chapter, verse in cur.execute('SELECT VerseId, Book, Chapter, Verse FROM Verses;'):
-                self._verses[(book, chapter, verse)] = verse_id
-                self._verses_id[verse_id] = (book, chapter, verse)
-
+                        src_book_names[self._normalize(item)] = row[0]
+            _shared[key] = src_book_names
+        return _shared[key]
+
+    @cached_property
+    def _fuzzy_index(self):
+        key = ('fuzzy', self._language, self._fuzzy)
+        if key not in _shared:
+            _shared[key] = DeletionIndex(self._src_book_names, self._fuzzy)
+        return _shared[key]
+
+    @cached_property
+    def _tr_book_names(self):
+        return self._book_names(self._translate, self._form)
+
+    def _book_names(self, language, form):
+        # output book names (by book number)
+        key = ('output', language, form, self._upper)
+        if key not in _shared:
+            names = ['Bible']
+            con = sqlite3.connect(self._path / 'res/resources.db')
+            cur = con.cursor()
+            for rec in cur.execute(f'SELECT * FROM Books WHERE Language = ?;', (language,)).fetchall():
+                if self._upper:
+                    tr = rec[form].upper()
+                else:
+                    tr = rec[form]
+                names.insert(rec[2], tr)
+            cur.close()
+            con.close()
+            _shared[key] = names
+        return _shared[key]
+
+    def _table(self, index):
+        # (ranges, chapters, chapters_id, verses, verses_id)
+        tables = load_tables(self._path / 'res/tables.bin') # memory-mapped: shared by all processes
+        if tables:
+            return tables[index]
+        key = ('table', index)
+        if key not in _shared: # not usable: only the needed table is loaded from the database
+            con = sqlite3.connect(self._path / 'res/resources.db')
+            cur = con.cursor()
+            if index == 0:
+                ranges = {}
+                for book, chapter, last in cur.execute('SELECT Book, Chapter, Last FROM Ranges;'):
+                    ranges[(book, chapter)] = last
+                _shared[key] = ranges
+            elif index in (1, 2):
+                chapters = {}
+                chapters_id = {}
+                for chapter_id, book, chapter in cur.execute('SELECT ChapterId, Book, Chapter FROM Chapters;'):
+                    chapters[(book, chapter)] = chapter_id
+                    chapters_id[chapter_id] = (book, chapter)
+                _shared[('table', 1)] = chapters
+                _shared[('table', 2)] = chapters_id
+            else:
+                verses = {}
+                verses_id = {}
+                for verse_id, book, chapter, verse in cur.execute('SELECT VerseId, Book, Chapter, Verse FROM Verses;'):
+                    verses[(book, chapter, verse)] = verse_id
+                    verses_id[verse_id] = (book, chapter, verse)
+                _shared[('table', 3)] = verses
+                _shared[('table', 4)] = verses_id
             cur.close()
             con.close()
+        return _shared[key]
 
-            self._headings = (3, 4, 5, 6, 7, 8, 9, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 34, 35, 36, 37, 38, 39, 40, 41, 42, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63, 64, 65, 66, 67, 68, 69, 70, 72, 73, 74, 75, 76, 77, 78, 79, 80, 81, 82, 83, 84, 85, 86, 87, 88, 89, 90, 92, 98, 100, 101, 102, 103, 108, 109, 110, 120, 121, 122, 123, 124, 125, 126, 127, 128, 129, 130, 131, 132, 133, 134, 138, 139, 140, 141, 142, 143, 144, 145)
-            self._reported = []
-            self._encoded = {}
-            self._linked = {}
+    @cached_property
+    def _ranges(self):
+        return self._table(0)
 
-            # Pass 1: Prefixed books WITH verses
-            self._pass1 = regex.compile(r'({{.*?}}|(?:(?<!\p{L})[1-5](?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}|\p{L}{1,2}(?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}))?|(?<!\p{L})[IV]{1,3}(?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}))\p{L}{2}[\p{L}\p{Pd}\.]*\p{Z}{0,2}\d+\p{L}?(?:\p{Z}{0,2}[:,\.\p{Pd};]\p{Z}{0,2}\d+\p{L}?)*(?![\p{Pd}\p{L}]))', flags=regex.IGNORECASE)
-            # Pass 2: Non-prefixed books WITH verses
-            self._pass2 = regex.compile(r'((?![^{]*})\p{L}{2}[\p{L}\p{Pd}\.]*\p{Z}{0,2}\d+\p{L}?(?:\p{Z}{0,2}[:,\.\p{Pd};]\p{Z}{0,2}\d+\p{L}?)*(?![\p{Pd}\p{L}]))', flags=regex.IGNORECASE)
-            # Pass 3: Prefixed books ONLY
-            self._pass3 = regex.compile(r'({{.*?}}|(?:(?<!\p{L})[1-5](?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}|\p{L}{1,2}(?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}))?|(?<!\p{L})[IV]{1,3}(?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}))\p{L}{2}[\p{L}\p{Pd}\.]*(?!\p{Z}{0,2}\d))', regex.IGNORECASE)
+    @cached_property
+    def _chapters(self):
+        return self._table(1)
 
+    @cached_property
+    def _chapters_id(self):
+        return self._table(2)
 
-            self._bk_ref = regex.compile(r"""(?i)((?:(?<!\p{L})[1-5]\p{L}{0,2}|(?<!\p{L})[IV]{1,3})?[\p{Pd}\.]?\p{Z}{0,2}\p{L}{2}[\p{L}\p{Pd}\.\p{Z}]*)(.*)""")
+    @cached_property
+    def _verses(self):
+        return self._table(3)
 
-            self._tagged = regex.compile(r'({{.*?}})')
-            self._cv_cv = regex.compile(r'(\d+):(\d+)-(\d+):(\d+)')
-            self._c_cv = regex.compile(r'(\d+)-(\d+):(\d+)')
-            self._cv_v = regex.compile(r'(\d+):(\d+)-(\d+)')
-            self._cv = regex.compile(r'(\d+):(\d+)')
-            self._dd_d = regex.compile(r'(\d+),(\d+)-(\d+)')
-            self._d_dd = regex.compile(r'(\d+)-(\d+),(\d+)')
-            self._d_d = regex.compile(r'(\d+)-(\d+)(?!:)')
-            self._d = regex.compile(r'(\d+)')
-            self._chunk = regex.compile(r'([^,;\p{Z}]+.*)')
-            self._sep = regex.compile(r'(?<!;)\s')
+    @cached_property
+    def _verses_id(self):
+        return self._table(4)
 
-        except Exception as e:
-            raise RuntimeError(f'Failed to initialize Scriptures: {str(e)}\n') from e
+    # patterns are compiled on first use (only those of the operations performed)
+
+    @cached_property
+    def _pass1(self):
+        # Pass 1: Prefixed books WITH verses
+        return regex.compile(r'({{[^{}\n]*+}}|(?:(?<!\p{L})[1-5](?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}|\p{L}{1,2}(?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}))?|(?<!\p{L})[IV]{1,3}(?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}))\p{L}{2}[\p{L}\p{Pd}\.]*+\p{Z}{0,2}\d+\p{L}?(?:\p{Z}{0,2}[:,\.\p{Pd};]\p{Z}{0,2}\d+\p{L}?)*(?![\p{Pd}\p{L}]))', flags=regex.IGNORECASE)
+
+    @cached_property
+    def _pass2(self):
+        # Pass 2: Non-prefixed books WITH verses (not within {{ }}: checked in _locate_scriptures)
+        # the run of letters/dashes/periods is scanned once, from its first pair of letters (linear time)
+        return regex.compile(r'(?:\G|(?<![\p{L}\p{Pd}\.]))(?:[\p{Pd}\.]|\p{L}(?!\p{L}))*+(\p{L}{2}[\p{L}\p{Pd}\.]*+\p{Z}{0,2}\d+\p{L}?(?:\p{Z}{0,2}[:,\.\p{Pd};]\p{Z}{0,2}\d+\p{L}?)*(?![\p{Pd}\p{L}]))', flags=regex.IGNORECASE)
+
+    @cached_property
+    def _pass3(self):
+        # Pass 3: Prefixed books ONLY
+        return regex.compile(r'({{[^{}\n]*+}}|(?:(?<!\p{L})[1-5](?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}|\p{L}{1,2}(?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}))?|(?<!\p{L})[IV]{1,3}(?:\p{Z}|\.\p{Z}{0,2}|\p{Pd}))\p{L}{2}[\p{L}\p{Pd}\.]*(?!\p{Z}{0,2}\d))', regex.IGNORECASE)
+
+    @cached_property
+    def _bk_ref(self):
+        return regex.compile(r"""(?i)((?:(?<!\p{L})[1-5]\p{L}{0,2}|(?<!\p{L})[IV]{1,3})?[\p{Pd}\.]?\p{Z}{0,2}\p{L}{2}[\p{L}\p{Pd}\.\p{Z}]*)(.*)""")
+
+    @cached_property
+    def _tagged(self):
+        return regex.compile(r'({{[^{}\n]*+}})')
+
+    @cached_property
+    def _cv_cv(self):
+        return regex.compile(r'(\d+):(\d+)-(\d+):(\d+)')
+
+    @cached_property
+    def _c_cv(self):
+        return regex.compile(r'(\d+)-(\d+):(\d+)')
+
+    @cached_property
+    def _cv_v(self):
+        return regex.compile(r'(\d+):(\d+)-(\d+)')
+
+    @cached_property
+    def _cv(self):
+        return regex.compile(r'(\d+):(\d+)')
+
+    @cached_property
+    def _dd_d(self):
+        return regex.compile(r'(\d+),(\d+)-(\d+)')
+
+    @cached_property
+    def _d_dd(self):
+        return regex.compile(r'(\d+)-(\d+),(\d+)')
+
+    @cached_property
+    def _d_d(self):
+        return regex.compile(r'(\d+)-(\d+)(?!:)')
+
+    @cached_property
+    def _d(self):
+        return regex.compile(r'(\d+)')
+
+    @cached_property
+    def _chunk(self):
+        return regex.compile(r'([^,;\p{Z}]+.*)')
+
+    @cached_property
+    def _sep(self):
+        return regex.compile(r'(?<!;)\s')
 
     def _error_report(self, scripture, message):
         if self._verbose and (scripture not in self._reported):
-            print(f'** "{scripture}" - {message}')
+            if self._messages is None:
+                print(f'** "{scripture}" - {message}')
+            else:
+                self._messages.append((self._stage, scripture, message))
             self._reported.append(scripture)
 
     def _scripture_parts(self, scripture):
 
         def check_book(bk_name):
-            if not self._nl:
-                bk_name = unidecode(bk_name) # NOTE: this converts Génesis to Genesis and English recognizes it !! Feature :-)
-            bk_name = regex.sub(r'\p{P}|\p{Z}', '', bk_name.upper())
-            if bk_name not in self._src_book_names:
-                return None, 0
-            else:
+            bk_name = self._normalize(bk_name)
+            if bk_name in self._src_book_names:
                 bk_num = self._src_book_names[bk_name]
+            elif self._fuzzy:
+                bk_num = self._fuzzy_index.lookup(bk_name) # None if not close enough (or ambiguous)
+                if not bk_num:
+                    return None, 0
+            else:
+                return None, 0
             return bk_num, self._ranges.get((bk_num, 0))
 
         reduced = regex.sub(r'\p{Z}', '', scripture)
@@ -172,11 +297,10 @@ class Scriptures():
             bk_num, last = check_book(bk_name)
             rest = regex.sub(r'(\d)\p{L}+', r'\1', rest) # strip off a, b, etc.
             if bk_num:
-                tr_name = self._tr_book_names[bk_num]
-                return tr_name, rest.replace('.', ':'), bk_num, last # for period notation cases (Gen 1.1)
-        return None, None, None, 0
+                return rest.replace('.', ':'), bk_num, last # for period notation cases (Gen 1.1)
+        return None, None, 0
 
-    def _locate_scriptures(self, text):
+    def _locate_scriptures(self, text, reported=None):
 
         def r(match):
             scripture = match.group(1)
@@ -187,7 +311,7 @@ class Scriptures():
                 tag = False
             if scripture in self._encoded.keys():
                 return '{{' + scripture +'}}'
-            _, rest, bk_num, last = self._scripture_parts(scripture)
+            rest, bk_num, last = self._scripture_parts(scripture)
             if bk_num:
                 code = self._code_scripture(scripture, bk_num, rest, last)
                 if code:
@@ -198,44 +322,107 @@ class Scriptures():
             else:
                 return scripture
 
-        self._reported = []
-        text = regex.sub(self._pass1, r, text)
-        text = regex.sub(self._pass2, r, text)
-        text = regex.sub(self._pass3, r, text)
-        return text
+        def r2(match):
+            lead = match.group(0)[:match.start(1)-match.start()]
+            i = bisect_left(braces, match.start(1))
+            if i < len(braces) and text[braces[i]] == '}': # already tagged (on the same line)
+                return match.group(0)
+            return lead + r(match)
 
+        def remaining():
+            if self._timeout is None:
+                return None
+            return max(deadline - time.monotonic(), 0)
+
+        self._reported = [] if reported is None else reported
+        if self._timeout is not None:
+            deadline = time.monotonic() + self._timeout
+        self._stage = 1 # (the pass an error is reported in)
+        text = regex.sub(self._pass1, r, text, timeout=remaining())
+        braces = [m.start() for m in regex.finditer(r'[{}\n]', text)]
+        self._stage = 2
+        text = regex.sub(self._pass2, r2, text, timeout=remaining())
+        self._stage = 3
+        text = regex.sub(self._pass3, r, text, timeout=remaining())
+        self._stage = 4 # output
+        return text
 
-    def list_scriptures(self, text):
+    def _scripture_spans(self, text, reported=None):
+        # (start, end, scripture) of each located scripture, as offsets into the original text (including any {{ }})
+        located = self._locate_scriptures(text, reported)
+        i = 0
+        j = 0
+        for match in regex.finditer(r'({{[^{}\n]*+}})|»»\||\|««', located):
+            j += match.start() - i
+            i = match.end()
+            if not match.group(1): # restored {{ or }} of unrecognized pre-tagged scripture
+                j += 2
+                continue
+            script = match.group(1).strip('}{')
+            if text.startswith(match.group(1), j): # pre-tagged
+                yield j, j + len(match.group(1)), script
+                j += len(match.group(1))
+            else:
+                yield j, j + len(script), script
+                j += len(script)
+
+
+    def _spans(self, text, size=1048576):
+        if isinstance(text, str):
+            yield from self._scripture_spans(text)
+            return
+        reported = [] # report errors only once over all the batches
+        offset = 0
+        batch = []
+        length = 0
+        for line in chain(text, [None]): # scriptures never span lines: batches of whole lines
+            if line is not None:
+                batch.append(line)
+                length += len(line)
+                if length < size:
+                    continue
+            chunk = ''.join(batch)
+            for start, end, scripture in self._scripture_spans(chunk, reported):
+                yield offset + start, offset + end, scripture
+            offset += len(chunk)
+            batch = []
+            length = 0
+
+    def list_scriptures(self, text, callback=None):
+        # text: a string, or an iterable of lines (e.g., a file) processed in batches
+        # callback: receives a record for each scripture (instead of returning a list)
         lst = []
-        text = self._locate_scriptures(text)
-        for scripture in regex.findall(self._tagged, text):
-            script = scripture.strip('}{')
+        for start, end, scripture in self._spans(text):
+            script = scripture
             if self._rewrite:
-                temp = self.decode_scriptures(self._encoded[script])
-                script = temp[0] if temp else script
+                script = next(self._decode_ranges(self._encoded[script]), script)
             if self._upper:
                 script = script.upper()
-            lst.append(script)
+            if callback:
+                callback({'reference': script, 'scripture': scripture, 'start': start, 'end': end})
+            else:
+                lst.append(script)
         return lst
 
-    def tag_scriptures(self, text, start_tag = "{{", end_tag = "}}"):
-        return self.rewrite_scriptures(text, True, start_tag, end_tag)
+    def tag_scriptures(self, text, start_tag = "{{", end_tag = "}}", html=False):
+        return self.rewrite_scriptures(text, True, start_tag, end_tag, html)
 
-    def rewrite_scriptures(self, text, tag=False, start_tag = "{{", end_tag = "}}"):
+    def rewrite_scriptures(self, text, tag=False, start_tag = "{{", end_tag = "}}", html=False):
 
-        def r(match):
-            script = match.group(1).strip('}{')
+        def r(script):
             if tag:
                 return start_tag + script + end_tag
             if self._rewrite:
-                temp = self.decode_scriptures(self._encoded[script])
-                script = temp[0] if temp else script
+                script = next(self._decode_ranges(self._encoded[script]), script)
             if self._upper:
                 script = script.upper()
             return script
 
+        if html:
+            from .markup import rewrite_html # only loaded if needed
+            return rewrite_html(self, text, r, html)
         text = self._locate_scriptures(text)
-        return regex.sub(self._tagged, r, text).replace('»»|', '{{').replace('|««', '}}')
+        return regex.sub(self._tagged, lambda m: r(m.group(1).strip('}{')), text).replace('»»|', '{{').replace('|««', '}}')
 
 
     def _code_scripture(self, scripture, bk_num, rest, last):
@@ -486,51 +673,62 @@ class Scriptures():
                 lst.append(tup)
         return lst
 
-    def code_scriptures(self, text, split=False):
-        text = self._locate_scriptures(text)
+    def code_scriptures(self, text, split=False, callback=None):
+        # text: a string, or an iterable of lines (e.g., a file) processed in batches
+        # callback: receives a record for each BCV range (instead of returning a list)
+
+        def split_chapters(bcv_ranges):
+            split_ranges = []
+            for start, end in bcv_ranges:
+                sb = int(start[:2])
+                sc = int(start[2:5])
+                sv = int(start[5:])
+                eb = int(end[:2])
+                ec = int(end[2:5])
+
+                if sb == eb and sc != ec:
+                    for chap in range(sc, ec + 1):
+                        if sb == 19 and chap in self._headings:
+                            minsv = 0
+                        elif sb == 43 and chap == 8:
+                            if sv < 12:
+                                sv = 12
+                            minsv = 12
+                        else:
+                            minsv = 1
+                        if chap == sc:
+                            chap_start = f"{sb:02d}{chap:03d}{sv:03d}"
+                            le = self._ranges.get((sb, chap), 0)
+                            chap_end = f"{sb:02d}{chap:03d}{le:03d}"
+                        elif chap == ec:
+                            chap_start = f"{sb:02d}{chap:03d}{minsv:03d}"
+                            chap_end = end
+                        else:
+                            le = self._ranges.get((sb, chap), 0)
+                            chap_start = f"{sb:02d}{chap:03d}{minsv:03d}"
+                            chap_end = f"{sb:02d}{chap:03d}{le:03d}"
+                        split_ranges.append((chap_start, chap_end))
+                else:
+                    split_ranges.append((start, end))
+            return split_ranges
+
         lst = []
-        for scripture in regex.findall(self._tagged, text):
-            bcv_ranges = self._encoded[scripture.strip('}{')]
+        for start, end, scripture in self._spans(text):
+            bcv_ranges = self._encoded[scripture]
             if split:
-                split_ranges = []
-                for start, end in bcv_ranges:
-                    sb = int(start[:2])
-                    sc = int(start[2:5])
-                    sv = int(start[5:])
-                    eb = int(end[:2])
-                    ec = int(end[2:5])
-
-                    if sb == eb and sc != ec:
-                        for chap in range(sc, ec + 1):
-                            if sb == 19 and chap in self._headings:
-                                minsv = 0
-                            elif sb == 43 and chap == 8:
-                                if sv < 12:
-                                    sv = 12
-                                minsv = 12
-                            else:
-                                minsv = 1
-                            if chap == sc:
-                                chap_start = f"{sb:02d}{chap:03d}{sv:03d}"
-                                le = self._ranges.get((sb, chap), 0)
-                                chap_end = f"{sb:02d}{chap:03d}{le:03d}"
-                            elif chap == ec:
-                                chap_start = f"{sb:02d}{chap:03d}{minsv:03d}"
-                                chap_end = end
-                            else:
-                                le = self._ranges.get((sb, chap), 0)
-                                chap_start = f"{sb:02d}{chap:03d}{minsv:03d}"
-                                chap_end = f"{sb:02d}{chap:03d}{le:03d}"
-                            split_ranges.append((chap_start, chap_end))
-                    else:
-                        split_ranges.append((start, end))
-                lst.extend(split_ranges)
+                bcv_ranges = split_chapters(bcv_ranges)
+            if callback:
+                for bcv_range in bcv_ranges:
+                    script = next(self._decode_ranges([bcv_range]), '')
+                    if self._upper:
+                        script = script.upper()
+                    callback({'bcv_start': bcv_range[0], 'bcv_end': bcv_range[1], 'scripture': scripture, 'start': start, 'end': end, 'reference': script})
             else:
                 lst.extend(bcv_ranges)
         return lst
 
 
-    def _decode_scripture(self, bcv_range, book='', chap=0, sep=';'):
+    def _decode_scripture(self, bcv_range, book='', chap=0, sep=';', names=None):
         if not bcv_range:
             return None, '', 0, False, ''
         start, end = bcv_range
@@ -565,7 +763,7 @@ class Scriptures():
             le += 1
         if not ((minsv <= sv <= se) & (minev <= ev <= le)): # verse(s) out of range
             return None, '', 0, False, ''
-        bk_name = self._tr_book_names[sb]
+        bk_name = (names or self._tr_book_names)[sb]
         if book == bk_name:
             cont = True
         else:
@@ -623,38 +821,11 @@ class Scriptures():
             scripture = regex.sub(self._sep, self._separator, scripture)
         return scripture.strip(), book, chap, cont, sep
 
-    def _combine_ranges(self, bcv_ranges):
-        if not bcv_ranges:
-            return []
-        groups = []
-        current_group = [bcv_ranges[0]]
-        for i in range(1, len(bcv_ranges)):
-            current = bcv_ranges[i]
-            current_book = int(current[0][:2])
-            group_book = int(current_group[0][0][:2])
-            if current_book == group_book:
-                current_group.append(current)
-            else:
-                groups.append(current_group)
-                current_group = [current]
-        groups.append(current_group)
-
-        combined_ranges = []
-        for group in groups:
-            verses = set()
-            bcvs = {}
-            for bcv_range in group:
-                ss = self.serial_verse_number(bcv_range[0])
-                es = self.serial_verse_number(bcv_range[1])
-                if ss is None or es is None:
-                    continue
-                bcvs[ss] = bcv_range[0]
-                bcvs[es] = bcv_range[1]
-                for serial in range(ss, es + 1):
-                    verses.add(serial)
-            if not verses:
-                continue
+    def _combine_ranges(self, bcv_ranges, reversed_ranges=False):
+        # consecutive ranges of the same book are combined (a group holds at most the verses of one book)
+        # invalid ranges are reported and skipped (reversed ones only if "reversed_ranges": the caller's input)
 
+        def combine(verses, bcvs):
             serial_ids = sorted(verses)
             i = 0
             while i < len(serial_ids):
@@ -667,32 +838,74 @@ class Scriptures():
                 start_bcv = bcvs.get(ss)
                 end_bcv = bcvs.get(es)
                 if start_bcv and end_bcv:
-                    combined_ranges.append([start_bcv, end_bcv])
+                    yield [start_bcv, end_bcv]
                 i = j
-        return combined_ranges
 
-    def decode_scriptures(self, bcv_ranges=[]):
-        try:
-            if not bcv_ranges:
-                return []
-            combined_ranges = self._combine_ranges(bcv_ranges)
-            scriptures = []
-            bk = ''
-            ch = 0
-            sep = ';'
-            for bcv_range in combined_ranges:
-                scripture, bk, ch, cont, sep = self._decode_scripture(bcv_range, bk, ch, sep)
-                if scripture:
-                    if cont:
-                        scriptures[-1] = scriptures[-1] + scripture
-                    else:
-                        scriptures.append(scripture)
+        group_book = None
+        verses = set()
+        bcvs = {}
+        for bcv_range in bcv_ranges:
+            try:
+                start, end = bcv_range
+                current_book = int(start[:2])
+                valid = current_book == int(end[:2])
+            except:
+                valid = False
+            if not valid:
+                self._error_report(str(bcv_range), 'INVALID RANGE')
+                continue
+            ss = self.serial_verse_number(start)
+            es = self.serial_verse_number(end)
+            if ss is None or es is None: # (reported)
+                continue
+            if ss > es:
+                if reversed_ranges:
+                    self._error_report(str(bcv_range), 'INVALID RANGE')
+                continue
+            if current_book != group_book:
+                yield from combine(verses, bcvs)
+                group_book = current_book
+                verses = set()
+                bcvs = {}
+            bcvs[ss] = start
+            bcvs[es] = end
+            for serial in range(ss, es + 1):
+                verses.add(serial)
+        yield from combine(verses, bcvs)
+
+    def _decode_ranges(self, bcv_ranges, names=None, reversed_ranges=False):
+        # yields each (combined) scripture as soon as it is complete
+        scripture = None
+        bk = ''
+        ch = 0
+        sep = ';'
+        for bcv_range in self._combine_ranges(bcv_ranges, reversed_ranges):
+            scrip, bk, ch, cont, sep = self._decode_scripture(bcv_range, bk, ch, sep, names)
+            if scrip:
+                if cont:
+                    scripture = scripture + scrip
+                else:
+                    if scripture is not None:
+                        yield scripture
+                    scripture = scrip
+        if scripture is not None:
+            yield scripture
+
+    def decode_scriptures(self, bcv_ranges=[], callback=None):
+        # bcv_ranges: a list, or any iterable of ranges (e.g., streams.read_ranges), decoded as it is read
+        # callback: receives a record for each (combined) scripture (instead of returning a list)
+        # invalid ranges are reported (if verbose) and skipped; errors reading "bcv_ranges" (or in "callback") are raised
+        scriptures = []
+        if not bcv_ranges:
             return scriptures
-        except:
-            return None
+        for scripture in self._decode_ranges(bcv_ranges, reversed_ranges=True):
+            if callback:
+                callback({'reference': scripture})
+            else:
+                scriptures.append(scripture)
+        return scriptures
 
-    def link_scriptures(self, text, prefix='<a href=', suffix='>'):
-        # this always rewrites (full by default); if rewrite not desired, get code the scripture and build your own link
+    def _link_scripture(self, scripture, prefix, suffix, names=None):
 
         def convert_range(bcv_range):
             if not bcv_range:
@@ -709,30 +922,75 @@ class Scriptures():
             else:
                 return f'{sb}:{sc}:{sv}-{eb}:{ec}:{ev}'
 
-        def r1(match):
-
-            def r2(match):
-                return f'{prefix}{lnk}{suffix}{match.group(1)}</a>'
+        def r(match):
+            return f'{prefix}{lnk}{suffix}{match.group(1)}</a>'
+
+        output = ''
+        bk = ''
+        ch = 0
+        sep = ';'
+        for bcv_range in self._encoded[scripture]:
+            scrip, bk, ch, _, sep = self._decode_scripture(bcv_range, bk, ch, sep, names)
+            if scrip:
+                lnk = convert_range(bcv_range)
+                output += regex.sub(self._chunk, r, scrip)
+        return output.strip(' ;,')
+
+    def link_scriptures(self, text, prefix='<a href=', suffix='>', html=False):
+        # this always rewrites (full by default); if rewrite not desired, get code the scripture and build your own link
 
-            scripture = match.group(1).strip('}{')
+        def r1(scripture):
             if scripture in self._linked.keys():
                 return self._linked[scripture]
-            output = ''
-            bk = ''
-            ch = 0
-            sep = ';'
-            for bcv_range in self._encoded[scripture]:
-                scrip, bk, ch, _, sep = self._decode_scripture(bcv_range, bk, ch, sep)
-                if scrip:
-                    lnk = convert_range(bcv_range)
-                    output += regex.sub(self._chunk, r2, scrip)
-            self._linked[scripture] = output.strip(' ;,')
+            output = self._link_scripture(scripture, prefix, suffix)
             if self._upper:
                 output = output.upper()
-            return output.strip(' ;,')
+            self._linked[scripture] = output
+            return output
 
+        if html:
+            from .markup import rewrite_html
+            return rewrite_html(self, text, r1, html)
         text = self._locate_scriptures(text)
-        return regex.sub(self._tagged, r1, text).replace('»»|', '{{').replace('|««', '}}')
+        return regex.sub(self._tagged, lambda m: r1(m.group(1).strip('}{')), text).replace('»»|', '{{').replace('|««', '}}')
+
+    def translate_many(self, text, targets=[], form=None, prefix=None, suffix='>'):
+        # the scriptures are located (and encoded) once and rewritten into each of the "targets" languages
+        # form: 'full', 'standard' or 'official' (same as the instance if not provided)
+        # prefix (and suffix): create links instead (like link_scriptures)
+        # returns a dictionary of the output text by language
+
+        def rewrite(script):
+            try:
+                temp = next(self._decode_ranges(self._encoded[script], names), None)
+            except:
+                temp = None
+            return temp or script
+
+        for target in targets:
+            if target not in _available_languages:
+                raise ValueError('Indicated translation language is not an option!')
+        form = _forms.get(form, 3) if form else self._form
+        pieces = self._tagged.split(self._locate_scriptures(text)) # tagged scriptures at the odd positions
+        for i in range(0, len(pieces), 2):
+            pieces[i] = pieces[i].replace('»»|', '{{').replace('|««', '}}')
+        results = {}
+        for target in targets:
+            names = self._book_names(target, form)
+            rendered = {}
+            output = pieces.copy()
+            for i in range(1, len(pieces), 2):
+                script = pieces[i].strip('}{')
+                if script not in rendered:
+                    if prefix is None:
+                        rendered[script] = rewrite(script)
+                    else:
+                        rendered[script] = self._link_scripture(script, prefix, suffix, names)
+                    if self._upper:
+                        rendered[script] = rendered[script].upper()
+                output[i] = rendered[script]
+            results[target] = ''.join(output)
+        return results
 
 
     def book_name(self, num):
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    HTML-aware processing (only text nodes are scanned)
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import html, regex
+from html.parser import HTMLParser
+
+
+skip_tags = ('a', 'script', 'style', 'textarea', 'title')
+_inline_tags = ('abbr', 'b', 'bdi', 'bdo', 'cite', 'data', 'dfn', 'em', 'font', 'i', 'kbd', 'mark', 'q', 's', 'samp', 'small', 'span', 'strong', 'sub', 'sup', 'time', 'u', 'var', 'wbr')
+_entity = regex.compile(r'&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);?')
+
+
+class _Rewriter(HTMLParser):
+    # streams the document to "write"; adjacent text (across inline tags) is processed as one run
+
+    def __init__(self, s, render, skip, write):
+        super().__init__(convert_charrefs=True)
+        self._s = s
+        self._render = render
+        self._skip = skip
+        self._write = write
+        self._pieces = [] # (raw, text): markup has no text; plain text has raw == text
+        self._pending = None
+        self._skipping = None
+        self._depth = 0
+        self._reported = [] # errors are reported once per document (not per text run)
+
+    def _flush(self):
+        pieces = self._pieces
+        self._pieces = []
+        text = ''.join(t for _, t in pieces)
+        spans = []
+        if regex.search(r'\d', text):
+            spans = [(start, end, self._render(script)) for start, end, script in self._s._scripture_spans(text, self._reported)]
+        if not spans:
+            for raw, _ in pieces:
+                self._write(raw)
+            return
+        k = 0
+        pos = 0
+        opened = False
+        held = [] # markup within a scripture: written after it
+        for raw, t in pieces:
+            end = pos + len(t)
+            if not t:
+                if k < len(spans) and spans[k][0] < pos < spans[k][1]:
+                    held.append(raw)
+                else:
+                    self._write(raw)
+                continue
+            if raw != t: # entity: can't be split
+                if k < len(spans) and pos < spans[k][1] and end > spans[k][0]:
+                    if not opened:
+                        self._write(spans[k][2])
+                        opened = True
+                    if end >= spans[k][1]:
+                        self._write(''.join(held))
+                        held = []
+                        opened = False
+                        k += 1
+                else:
+                    self._write(raw)
+                pos = end
+                continue
+            i = pos
+            while i < end:
+                if k < len(spans) and spans[k][0] <= i:
+                    if not opened:
+                        self._write(spans[k][2])
+                        opened = True
+                    i = min(end, spans[k][1])
+                    if i == spans[k][1]:
+                        self._write(''.join(held))
+                        held = []
+                        opened = False
+                        k += 1
+                else:
+                    j = min(end, spans[k][0]) if k < len(spans) else end
+                    self._write(t[i-pos:j-pos])
+                    i = j
+            pos = end
+        self._write(''.join(held))
+
+    def _markup(self, raw, inline=False):
+        if self._skipping:
+            self._write(raw)
+        elif inline:
+            self._pieces.append((raw, ''))
+        else:
+            self._flush()
+            self._write(raw)
+
+    def _text(self, raw, data):
+        if self._skipping:
+            self._write(raw)
+        elif raw == data:
+            self._pieces.append((raw, data))
+        else: # split off the character references
+            pieces = []
+            i = 0
+            for match in _entity.finditer(raw):
+                if match.start() > i:
+                    pieces.append((raw[i:match.start()], raw[i:match.start()]))
+                pieces.append((match.group(0), html.unescape(match.group(0))))
+                i = match.end()
+            if i < len(raw):
+                pieces.append((raw[i:], raw[i:]))
+            if ''.join(t for _, t in pieces) != data:
+                pieces = [(html.escape(c, quote=False), c) for c in data]
+            self._pieces.extend(pieces)
+
+    def updatepos(self, i, j):
+        # called after each construct is parsed (and its handler has run): rawdata[i:j] is its source
+        if self._pending and i < j:
+            kind, tag, data = self._pending
+            raw = self.rawdata[i:j]
+            if kind == 'data':
+                self._text(raw, data)
+            elif kind == 'start':
+                if self._skipping:
+                    if tag == self._skipping:
+                        self._depth += 1
+                    self._write(raw)
+                elif tag in self._skip:
+                    self._flush()
+                    self._write(raw)
+                    self._skipping = tag
+                    self._depth = 1
+                else:
+                    self._markup(raw, tag in _inline_tags)
+            elif kind == 'end':
+                if self._skipping and tag == self._skipping:
+                    self._depth -= 1
+                    if not self._depth:
+                        self._skipping = None
+                    self._write(raw)
+                else:
+                    self._markup(raw, tag in _inline_tags)
+            else:
+                self._markup(raw, kind == 'void' and tag in _inline_tags)
+        elif i < j:
+            self._markup(self.rawdata[i:j])
+        self._pending = None
+        return super().updatepos(i, j)
+
+    def handle_starttag(self, tag, attrs):
+        self._pending = ('start', tag, None)
+
+    def handle_startendtag(self, tag, attrs):
+        self._pending = ('void', tag, None)
+
+    def handle_endtag(self, tag):
+        self._pending = ('end', tag, None)
+
+    def handle_data(self, data):
+        self._pending = ('data', None, data)
+
+    def close(self):
+        super().close()
+        if self._pending: # unfinished construct at the end of the document
+            self._pending = None
+            self._markup(self.rawdata)
+            self.rawdata = ''
+        self._flush()
+
+
+def rewrite_html(s, text, render, skip=True):
+    # "skip": tags whose content is left untouched (True for the default skip_tags)
+    out = []
+    parser = _Rewriter(s, render, skip_tags if skip is True else tuple(skip), out.append)
+    parser.feed(text)
+    parser.close()
+    return ''.join(out)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Process a single (large) document in segments, in parallel
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .linkture import Scriptures
+
+
+methods = ('link_scriptures', 'tag_scriptures', 'rewrite_scriptures', 'list_scriptures', 'code_scriptures')
+_s = None # per-process instance (inherited when workers are forked)
+
+
+def _init(config):
+    global _s
+    if _s is None:
+        _s = Scriptures(**config)
+
+def _call(process, job):
+    return process(_s, job)
+
+def run_jobs(s, process, jobs, workers=None):
+    # yields process(instance, job) for each of "jobs", in order, run by a pool of workers set up like "s" (by "s" itself if workers == 1)
+    # "process" must be a module-level function; only a few jobs are pending at a time, so "jobs" is read as needed
+    global _s
+    _s = s
+    if workers == 1:
+        for job in jobs:
+            yield process(s, job)
+        return
+    limit = 2 * (workers or os.cpu_count() or 1)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(s._config,))
+    pending = deque()
+    try:
+        for job in jobs:
+            pending.append(pool.submit(_call, process, job))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def _process(s, job):
+    batch, method, text, args, records = job
+    s._messages = [] # error reports are returned, to be shown in order (see below)
+    try:
+        if records:
+            result = []
+            getattr(s, method)(text, *args, callback=result.append)
+        else:
+            result = getattr(s, method)(text, *args)
+        return batch, len(text), result, s._messages
+    finally:
+        s._messages = None
+
+def _segments(text, size, batch_size=1048576):
+    # (batch, segment): whole lines (scriptures never span lines) of about "size" characters
+    # an iterable is read in batches by a serial call (see Scriptures._spans): segments don't cross them
+    if isinstance(text, str):
+        start = 0
+        while start < len(text):
+            end = text.find('\n', start + size - 1)
+            end = len(text) if end < 0 else end + 1
+            yield 0, text[start:end]
+            start = end
+        return
+    batch = 0
+    lines = []
+    length = 0
+    total = 0
+    for line in text:
+        lines.append(line)
+        length += len(line)
+        total += len(line)
+        if length >= size or total >= batch_size:
+            yield batch, ''.join(lines)
+            lines = []
+            length = 0
+        if total >= batch_size:
+            batch += 1
+            total = 0
+    if lines:
+        yield batch, ''.join(lines)
+
+
+def process_parallel(s, text, method='rewrite_scriptures', args=(), workers=None, size=1048576, callback=None):
+    # splits "text" (a string, or an iterable of lines) into segments of whole lines (of about "size" characters),
+    # processes them with a pool of workers set up like "s" and returns the same as getattr(s, method)(text, *args):
+    #   link_scriptures, tag_scriptures, rewrite_scriptures: the text (or each segment is passed to "callback")
+    #   list_scriptures, code_scriptures: the list (or each record is passed to "callback", offsets into the whole text)
+    # error reports are shown (once each) after processing, in the order a serial call would show them
+    if method not in methods:
+        raise ValueError('Indicated method is not an option!')
+    records = callback is not None and method in ('list_scriptures', 'code_scriptures')
+    jobs = ((batch, method, segment, args, records) for batch, segment in _segments(text, size))
+    results = run_jobs(s, _process, jobs, workers)
+    output = []
+    reports = []
+    offset = 0
+    try:
+        for number, (batch, length, result, messages) in enumerate(results):
+            for i, (stage, scripture, message) in enumerate(messages):
+                # a serial call goes batch by batch (one for a string), pass by pass
+                reports.append(((batch, stage, number, i), scripture, message))
+            if records:
+                for record in result:
+                    record['start'] += offset
+                    record['end'] += offset
+                    callback(record)
+            elif callback:
+                callback(result)
+            else:
+                output.append(result)
+            offset += length
+    finally:
+        results.close()
+    s._reported = []
+    for _, scripture, message in sorted(reports, key=lambda report: report[0]):
+        s._error_report(scripture, message)
+    if callback:
+        return None
+    if method in ('list_scriptures', 'code_scriptures'):
+        return [item for result in output for item in result]
+    return ''.join(output)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Corpus-level citation statistics (most cited books, chapters and verses)
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+from array import array
+from itertools import accumulate
+from .linkture import Scriptures
+
+
+levels = ('books', 'chapters', 'verses')
+
+
+class CitationStats():
+    # counts are kept in difference arrays over the serial numbers (index 0 unused): a cited range adds 1
+    # at its first entry and subtracts 1 after its last, so any range costs the same (even a whole book)
+
+    def __init__(self, scriptures=None, **kwargs):
+        try:
+            self._s = scriptures or Scriptures(**kwargs)
+            self._books = array('q', [0] * 68)
+            self._chapters = array('q', [0] * 1191)
+            self._verses = array('q', [0] * 31196)
+        except Exception as e:
+            raise RuntimeError(f'Failed to initialize CitationStats: {str(e)}\n') from e
+
+    def _chapter_range(self, serial):
+        book, chapter = self._s._chapters_id[serial]
+        bc = f'{book:02d}{chapter:03d}'
+        if book == 19 and chapter in self._s._headings: # some chapters start at verse 0
+            v = 0
+        elif book == 43 and chapter == 8:
+            v = 12
+        else:
+            v = 1
+        return f'{bc}{v:03d}', f'{bc}{self._s._ranges.get((book, chapter)):03d}'
+
+
+    def add_document(self, text):
+        # text: a string, or an iterable of lines (e.g., a file)
+        return self.add_ranges(self._s.code_scriptures(text))
+
+    def add_ranges(self, bcv_ranges):
+        # bcv_ranges: a list, or any iterable of ranges (e.g., streams.read_ranges); returns the number counted
+        count = 0
+        for bcv_range in bcv_ranges:
+            try:
+                start, end = bcv_range
+                sb, eb = int(start[:2]), int(end[:2])
+            except:
+                self._s._error_report(str(bcv_range), 'INVALID RANGE')
+                continue
+            ss = self._s.serial_verse_number(start)
+            es = self._s.serial_verse_number(end)
+            sc = self._s.serial_chapter_number(start)
+            ec = self._s.serial_chapter_number(end)
+            if None in (ss, es, sc, ec):
+                continue
+            for counts, first, last in ((self._books, sb, eb), (self._chapters, sc, ec), (self._verses, ss, es)):
+                if first > last: # reversed
+                    first, last = last, first
+                counts[first] += 1
+                counts[last + 1] -= 1
+            count += 1
+        return count
+
+    def top(self, level='verses', limit=None, callback=None):
+        # most-cited books, chapters or verses (by count, then in Bible order): list of (reference, count)
+        # callback: receives a record for each (instead of returning a list)
+        if level not in levels:
+            raise ValueError('Indicated level is not an option!')
+        counts = {'books': self._books, 'chapters': self._chapters, 'verses': self._verses}[level]
+        rows = [(-total, serial) for serial, total in enumerate(accumulate(counts[:-1])) if total > 0]
+        rows.sort()
+        lst = []
+        for total, serial in rows[:limit]:
+            if level == 'books':
+                last = self._s._ranges.get((serial, 0))
+                start = f'{serial:02d}001001'
+                end = f'{serial:02d}{last:03d}{self._s._ranges.get((serial, last)):03d}'
+            elif level == 'chapters':
+                start, end = self._chapter_range(serial)
+            else:
+                bk, ch, vs = self._s._verses_id[serial - 1]
+                start = end = f'{bk:02d}{ch:03d}{vs:03d}'
+            temp = self._s.decode_scriptures([(start, end)])
+            if temp:
+                reference = temp[0]
+            elif level == 'verses': # Psalm heading (verse 0)
+                reference = f'{self._s.book_name(bk)} {ch}:{vs}'
+            else:
+                reference = start
+            if callback:
+                callback({'reference': reference, 'bcv_start': start, 'bcv_end': end, 'count': -total})
+            else:
+                lst.append((reference, -total))
+        return lst
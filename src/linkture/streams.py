@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Streaming output writers and BCV-range readers (repr, JSON Lines, CSV, TSV, binary)
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import csv, json, regex, sys
+from array import array
+
+
+output_formats = ('repr', 'jsonl', 'csv', 'tsv')
+input_formats = ('repr', 'jsonl', 'csv', 'tsv', 'bin')
+
+# record fields of list_scriptures, code_scriptures and decode_scriptures (and the items of their returned lists)
+list_fields = (('reference', 'scripture', 'start', 'end'), ('reference',))
+code_fields = (('bcv_start', 'bcv_end', 'scripture', 'start', 'end', 'reference'), ('bcv_start', 'bcv_end'))
+decode_fields = (('reference',), ('reference',))
+stats_fields = (('reference', 'bcv_start', 'bcv_end', 'count'), ('reference', 'count')) # of CitationStats.top
+
+
+class Writer():
+    # callable: pass it as the "callback" to write each record as soon as it is produced
+    # "repr" writes the same as str() of the list the method would return
+
+    def __init__(self, stream, form='repr', fields=list_fields):
+        if form not in output_formats:
+            raise ValueError('Indicated output format is not an option!')
+        self._stream = stream
+        self._form = form
+        self._fields, self._items = fields
+        self._count = 0
+        if form == 'repr':
+            stream.write('[')
+        elif form in ('csv', 'tsv'):
+            self._csv = csv.writer(stream, delimiter=',' if form == 'csv' else '\t', lineterminator='\n')
+            self._csv.writerow(self._fields)
+
+    def __call__(self, record):
+        if self._form == 'repr':
+            if len(self._items) == 1:
+                item = record[self._items[0]]
+            else:
+                item = tuple(record[field] for field in self._items)
+            self._stream.write(f', {item!r}' if self._count else repr(item))
+        elif self._form == 'jsonl':
+            self._stream.write(json.dumps({field: record.get(field) for field in self._fields}, ensure_ascii=False) + '\n')
+        else:
+            self._csv.writerow([record.get(field, '') for field in self._fields])
+        self._count += 1
+
+    def close(self):
+        if self._form == 'repr':
+            self._stream.write(']')
+        self._stream.flush()
+        return self._count
+
+
+_item = regex.compile(r'\(([^()\[\]]*[^()\[\]\s][^()\[\]]*)\)|\[([^()\[\]]*[^()\[\]\s][^()\[\]]*)\]') # innermost (...) or [...], not empty
+
+def _bcv(value):
+    value = str(value).strip().strip('\'"')
+    return value.zfill(8) if value.isdigit() else value # also restores leading zeros lost in spreadsheets
+
+def _pair(values):
+    # (start, end); anything else is passed on as is, to be reported when decoding
+    return tuple(_bcv(value) for value in values) if len(values) == 2 else tuple(values)
+
+def read_ranges(stream, form='repr', size=1048576):
+    # yields the BCV ranges of "stream" as they are read (a binary stream for "bin")
+    #   repr:  a Python list of tuples, as output by -c (or anything with "(start, end)" items)
+    #   jsonl: {"bcv_start": ..., "bcv_end": ...} records, as output by -c --format jsonl (or [start, end] lists)
+    #   csv/tsv: start and end in the first two columns (an optional header row is skipped)
+    #   bin:   pairs of little-endian uint32 (start, end)
+    if form not in input_formats:
+        raise ValueError('Indicated input format is not an option!')
+    if form == 'repr':
+        rest = ''
+        while True:
+            block = stream.read(size)
+            text = rest + block
+            end = 0
+            for match in _item.finditer(text):
+                item = match.group(1) if match.group(1) is not None else match.group(2)
+                yield _pair(item.split(','))
+                end = match.end()
+            if not block:
+                break
+            rest = text[end:] # an item may continue in the next block (from its opening bracket)
+            i = max(rest.rfind('('), rest.rfind('['))
+            rest = rest[i:] if 0 <= i and len(rest) - i < 1024 else '' # (not an item if longer)
+    elif form == 'jsonl':
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield (line,)
+                continue
+            if isinstance(record, dict):
+                yield _pair([record.get('bcv_start', ''), record.get('bcv_end', '')])
+            elif isinstance(record, list):
+                yield _pair(record)
+            else:
+                yield (line,)
+    elif form == 'bin':
+        while True:
+            block = stream.read(size - size % 8)
+            if not block:
+                break
+            values = array('I')
+            values.frombytes(block[:len(block) - len(block) % 8])
+            if sys.byteorder != 'little':
+                values.byteswap()
+            for i in range(0, len(values), 2):
+                yield (f'{values[i]:08d}', f'{values[i+1]:08d}')
+            if len(block) % 8:
+                yield (block[len(block) - len(block) % 8:].hex(),) # incomplete record
+    else:
+        first = True
+        for row in csv.reader(stream, delimiter=',' if form == 'csv' else '\t'):
+            if not row:
+                continue
+            if first and not row[0].strip().isdigit(): # header
+                first = False
+                continue
+            first = False
+            yield _pair(row[:2])
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Memory-mapped verse/chapter tables (shared between processes)
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+# Layout of res/tables.bin (all values little-endian uint32):
+#   header:   MAGIC, VERSION, books (67), chapters (1190), verses (31194)
+#   books:    first ChapterId, number of chapters          (indexed by book number; 0 unused)
+#   chapters: book * 1000 + chapter, first VerseId,
+#             first verse number, last verse number        (indexed by ChapterId; 0 unused)
+#   verses:   book * 1000000 + chapter * 1000 + verse      (indexed by VerseId)
+
+import mmap, sqlite3, sys
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+
+
+MAGIC = 0x544b4e4c # 'LNKT'
+VERSION = 1
+_header = 5
+_usable = sys.byteorder == 'little' and array('I').itemsize == 4
+_loaded = {}
+
+
+class _Tables():
+
+    def __init__(self, buf):
+        words = memoryview(buf).cast('I')
+        if len(words) < _header or words[0] != MAGIC or words[1] != VERSION:
+            raise ValueError('Not a (compatible) tables file')
+        books, chapters, verses = words[2], words[3], words[4]
+        if len(words) != _header + 2 * books + 4 * chapters + verses:
+            raise ValueError('Truncated tables file')
+        i = _header
+        self.book_first, i = words[i:i+books], i + books
+        self.book_chapters, i = words[i:i+books], i + books
+        self.chapter_bc, i = words[i:i+chapters], i + chapters
+        self.chapter_serial, i = words[i:i+chapters], i + chapters
+        self.chapter_min, i = words[i:i+chapters], i + chapters
+        self.chapter_last, i = words[i:i+chapters], i + chapters
+        self.verse_bcv = words[i:i+verses]
+
+    def chapter_id(self, book, chapter):
+        if 0 < book < len(self.book_first) and 0 < chapter <= self.book_chapters[book]:
+            return self.book_first[book] + chapter - 1
+        return None
+
+
+class _Ranges(Mapping): # (book, chapter) -> last verse; (book, 0) -> last chapter
+
+    def __init__(self, t):
+        self._t = t
+
+    def __getitem__(self, key):
+        book, chapter = key
+        if chapter == 0 and 0 < book < len(self._t.book_chapters):
+            return self._t.book_chapters[book]
+        chapter_id = self._t.chapter_id(book, chapter)
+        if chapter_id is None:
+            raise KeyError(key)
+        return self._t.chapter_last[chapter_id]
+
+    def __iter__(self):
+        for chapter_id in range(1, len(self._t.chapter_bc)):
+            bc = self._t.chapter_bc[chapter_id]
+            if bc % 1000 == 1:
+                yield (bc // 1000, 0)
+            yield divmod(bc, 1000)
+
+    def __len__(self):
+        return len(self._t.book_first) - 1 + len(self._t.chapter_bc) - 1
+
+
+class _Chapters(Mapping): # (book, chapter) -> ChapterId
+
+    def __init__(self, t):
+        self._t = t
+
+    def __getitem__(self, key):
+        chapter_id = self._t.chapter_id(*key)
+        if chapter_id is None:
+            raise KeyError(key)
+        return chapter_id
+
+    def __iter__(self):
+        for chapter_id in range(1, len(self._t.chapter_bc)):
+            yield divmod(self._t.chapter_bc[chapter_id], 1000)
+
+    def __len__(self):
+        return len(self._t.chapter_bc) - 1
+
+
+class _ChapterIds(Mapping): # ChapterId -> (book, chapter)
+
+    def __init__(self, t):
+        self._t = t
+
+    def __getitem__(self, key):
+        if not (0 < key < len(self._t.chapter_bc)):
+            raise KeyError(key)
+        return divmod(self._t.chapter_bc[key], 1000)
+
+    def __iter__(self):
+        return iter(range(1, len(self._t.chapter_bc)))
+
+    def __len__(self):
+        return len(self._t.chapter_bc) - 1
+
+
+class _Verses(Mapping): # (book, chapter, verse) -> VerseId
+
+    def __init__(self, t):
+        self._t = t
+
+    def __getitem__(self, key):
+        book, chapter, verse = key
+        chapter_id = self._t.chapter_id(book, chapter)
+        if chapter_id is None or not (self._t.chapter_min[chapter_id] <= verse <= self._t.chapter_last[chapter_id]):
+            raise KeyError(key)
+        return self._t.chapter_serial[chapter_id] + verse - self._t.chapter_min[chapter_id]
+
+    def __iter__(self):
+        for bcv in self._t.verse_bcv:
+            bc, verse = divmod(bcv, 1000)
+            yield (*divmod(bc, 1000), verse)
+
+    def __len__(self):
+        return len(self._t.verse_bcv)
+
+
+class _VerseIds(Mapping): # VerseId -> (book, chapter, verse)
+
+    def __init__(self, t):
+        self._t = t
+
+    def __getitem__(self, key):
+        if not (0 <= key < len(self._t.verse_bcv)):
+            raise KeyError(key)
+        bc, verse = divmod(self._t.verse_bcv[key], 1000)
+        return (*divmod(bc, 1000), verse)
+
+    def __iter__(self):
+        return iter(range(len(self._t.verse_bcv)))
+
+    def __len__(self):
+        return len(self._t.verse_bcv)
+
+
+def load_tables(path):
+    # returns (ranges, chapters, chapters_id, verses, verses_id) mappings, or None if the file can't be used
+    path = str(path)
+    if path in _loaded:
+        return _loaded[path]
+    tables = None
+    if _usable:
+        try:
+            with open(path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            t = _Tables(mm)
+            tables = (_Ranges(t), _Chapters(t), _ChapterIds(t), _Verses(t), _VerseIds(t))
+        except (OSError, ValueError):
+            tables = None
+    _loaded[path] = tables
+    return tables
+
+def build_tables(db_path, path):
+    con = sqlite3.connect(db_path)
+    cur = con.cursor()
+    ranges = dict(((book, chapter), last) for book, chapter, last in cur.execute('SELECT Book, Chapter, Last FROM Ranges;'))
+    chapters = cur.execute('SELECT ChapterId, Book, Chapter FROM Chapters ORDER BY ChapterId;').fetchall()
+    verses = cur.execute('SELECT VerseId, Book, Chapter, Verse FROM Verses ORDER BY VerseId;').fetchall()
+    cur.close()
+    con.close()
+
+    books = max(book for book, _ in ranges) + 1
+    book_first = array('I', [0] * books)
+    book_chapters = array('I', [0] * books)
+    for (book, chapter), last in ranges.items():
+        if chapter == 0:
+            book_chapters[book] = last
+    size = chapters[-1][0] + 1
+    chapter_bc = array('I', [0] * size)
+    chapter_serial = array('I', [0] * size)
+    chapter_min = array('I', [0] * size)
+    chapter_last = array('I', [0] * size)
+    for chapter_id, book, chapter in chapters:
+        if chapter == 1:
+            book_first[book] = chapter_id
+        elif chapter_bc[chapter_id - 1] != book * 1000 + chapter - 1:
+            raise ValueError(f'Chapters of book {book} are not consecutive')
+        chapter_bc[chapter_id] = book * 1000 + chapter
+        chapter_last[chapter_id] = ranges[(book, chapter)]
+    verse_bcv = array('I', [0] * len(verses))
+    previous = None
+    for verse_id, book, chapter, verse in verses:
+        if verse_id >= len(verses):
+            raise ValueError('Verse ids are not consecutive')
+        verse_bcv[verse_id] = (book * 1000 + chapter) * 1000 + verse
+        chapter_id = book_first[book] + chapter - 1
+        if (book, chapter) != previous:
+            chapter_serial[chapter_id] = verse_id
+            chapter_min[chapter_id] = verse
+            previous = (book, chapter)
+        elif verse_id - chapter_serial[chapter_id] != verse - chapter_min[chapter_id]:
+            raise ValueError(f'Verses of {book}:{chapter} are not consecutive')
+
+    data = array('I', [MAGIC, VERSION, books, size, len(verses)])
+    for part in (book_first, book_chapters, chapter_bc, chapter_serial, chapter_min, chapter_last, verse_bcv):
+        data.extend(part)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    with open(path, 'wb') as f:
+        data.tofile(f)
+
+
+if __name__ == "__main__":
+    res = Path(__file__).resolve().parent / 'res'
+    build_tables(res / 'resources.db', res / 'tables.bin')
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Adversarial inputs: locating scriptures must stay (near) linear
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import random, sys, time
+import pytest
+from linkture import Scriptures
+from linkture.__main__ import main_cli
+
+
+_words = 'the of and in to that was he for it with as his on be at by this had not are but from or have an they which one you were her all she there would their we him been has when who will more no if out so said what up its about into than them can only other new some could time these two may then do first any my now such like our over man me even most made after also did many before must through back years where much your way well down should because each just those people how too little'.split()
+
+def _prose(n):
+    rnd = random.Random(n)
+    return ' '.join('John 3:16' if i % 50 == 0 else rnd.choice(_words) for i in range(n))
+
+# (generator, n): run with n and 4n
+_inputs = {
+    'prose': (_prose, 4000),
+    'letters and dashes': (lambda n: 'a-' * n, 4000),
+    'unmatched braces': (lambda n: '{{a ' * n, 4000),
+    'digits and letters': (lambda n: '1 ab' * n, 1000),
+    'chapter colons': (lambda n: 'John ' + '1:' * n, 4000),
+}
+
+def _seconds(s, text, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        s.rewrite_scriptures(text)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+@pytest.mark.parametrize('name', _inputs)
+def test_near_linear(name):
+    generator, n = _inputs[name]
+    s = Scriptures()
+    s.rewrite_scriptures(generator(10)) # (loads names, tables and patterns)
+    small = _seconds(s, generator(n))
+    large = _seconds(s, generator(4 * n))
+    # 4x the input: about 4x the time (16x if quadratic)
+    assert large < 8 * max(small, 0.005), f'{name}: {small:.4f}s for n={n}, {large:.4f}s for n={4*n}'
+
+def test_timeout():
+    s = Scriptures(timeout=0.0001)
+    with pytest.raises(TimeoutError):
+        s.rewrite_scriptures(_prose(200000))
+    with pytest.raises(TimeoutError):
+        s.list_scriptures('1 ab' * 100000)
+
+def test_no_timeout():
+    s = Scriptures(timeout=60)
+    assert s.list_scriptures('{{a ' * 1000 + 'Joh 17:17') == ['Joh 17:17']
+
+def test_cli_timeout(capsys, monkeypatch, tmp_path):
+    path = tmp_path / 'in.txt'
+    path.write_text(_prose(200000), encoding='UTF-8')
+    monkeypatch.setattr(sys, 'argv', ['linkture', '-f', str(path), '--timeout', '0.0001', '-o', str(tmp_path / 'out.txt')])
+    with pytest.raises(SystemExit) as e:
+        main_cli()
+    assert e.value.code == 1
+    output = capsys.readouterr().out
+    assert 'Time limit exceeded' in output
+    assert 'usage:' not in output
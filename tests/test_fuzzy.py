@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Typo-tolerant (fuzzy) book names
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import pytest
+from linkture import Scriptures
+
+
+@pytest.mark.parametrize('text, bcv', [
+    ('Mathew 5:3', ('40005003', '40005003')),
+    ('Revalation 21:4', ('66021004', '66021004')),
+    ('Philipians 4:13', ('50004013', '50004013')),
+    ('Gensis 1:1', ('01001001', '01001001')),
+])
+def test_misspelled(text, bcv):
+    assert Scriptures().code_scriptures(text) == [] # (not without fuzzy)
+    assert Scriptures(fuzzy=True).code_scriptures(text) == [bcv]
+    assert Scriptures(fuzzy=2).code_scriptures(text) == [bcv]
+
+@pytest.mark.parametrize('text', [
+    'Number 5:1', # only differs by its ending (from "Numbers")
+    'Marks 3:1',
+    'Ruht 1:1', # short names need to be exact
+    'Jon 3:16',
+])
+def test_rejected(text):
+    assert Scriptures(fuzzy=True).code_scriptures(text) == []
+    assert Scriptures(fuzzy=2).code_scriptures(text) == []
+
+def test_distance():
+    assert Scriptures(fuzzy=1).code_scriptures('Revalaton 21:4') == [] # 2 edits
+    assert Scriptures(fuzzy=2).code_scriptures('Revalaton 21:4') == [('66021004', '66021004')]
+    assert Scriptures(fuzzy=1).code_scriptures('Phillipians 4:13') == []
+    assert Scriptures(fuzzy=2).code_scriptures('Phillipians 4:13') == [('50004013', '50004013')]
+
+def test_beyond_distance():
+    # deletion variants within the distance may meet although the names are farther apart
+    assert Scriptures(fuzzy=1).code_scriptures('Mathews 3:4') == [] # "MATTHEW" is 2 edits away
+    assert Scriptures(fuzzy=2).code_scriptures('Revalatonn 21:4') == [] # "REVELATION" is 3 edits away
+
+def test_exact_first():
+    s = Scriptures(fuzzy=True)
+    assert s.code_scriptures('Numbers 5:1; Jhn 3:16') == [('04005001', '04005001'), ('43003016', '43003016')]
+    assert s.list_scriptures('Mathew 5:3; Revalation 21:4') == ['Mathew 5:3', 'Revalation 21:4']
+
+def test_rewritten():
+    s = Scriptures(fuzzy=True, form='full')
+    assert s.rewrite_scriptures('See Mathew 5:3.') == 'See Matthew 5:3.'
+
+def test_invalid_distance():
+    with pytest.raises(RuntimeError):
+        Scriptures(fuzzy=-1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    HTML-aware processing (markup is passed through untouched)
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import pytest
+from linkture import Scriptures
+
+
+def _link(text, **kwargs):
+    return Scriptures(**kwargs).link_scriptures(text, '<a href="', '">', html=True)
+
+
+@pytest.mark.parametrize('text', [
+    '<!DOCTYPE html><html><head><title>Joh 3:16</title><script>var a = "Joh 3:16" < 2 && b;</script>'
+    '<style>p{x:1}</style></head><body><!-- Joh 3:16 --><p class="x" data-r="Joh 3:16">Text &amp; more '
+    '&nbsp; &#169; &copy</p><br/><img src="a.png"></body></html>',
+    '<p>unfinished <b',
+    '<p>unfinished <!-- comment',
+    '<p>unfinished &am',
+    '',
+])
+def test_round_trip(text):
+    assert _link(text) == text # no references (outside markup): output is identical to input
+
+
+@pytest.mark.parametrize('text, result', [
+    ('<p>See <i>John</i> 3:16 and <b>Gen</b> <b>1:1</b>.</p>',
+     '<p>See <i><a href="43:3:16">John 3:16</a></i> and <b><a href="1:1:1">Genesis 1:1</a></b><b></b>.</p>'),
+    ('<p>Joh 3:16 <', '<p><a href="43:3:16">John 3:16</a> <'),
+    ('<p>Joh 3:16 &am', '<p><a href="43:3:16">John 3:16</a> &am'),
+])
+def test_split(text, result):
+    assert _link(text) == result # markup held inside a reference is moved after it
+
+
+@pytest.mark.parametrize('text, result', [
+    ('<p>Joh&nbsp;3:16 &amp; Gen 1:1&amp;x</p>',
+     '<p><a href="43:3:16">John 3:16</a> &amp; <a href="1:1:1">Genesis 1:1</a>&amp;x</p>'),
+    ('<p>Joh 3:&#49;6</p>', '<p><a href="43:3:16">John 3:16</a></p>'),
+])
+def test_entities(text, result):
+    assert _link(text) == result
+
+
+@pytest.mark.parametrize('text', [
+    '<p><a href="x">Joh 3:16 <a>inner</a> Gen 1:1</a> Ps 23</p>',
+    '<p><a href="x"><span><a>Joh 3:16</a></span> Gen 1:1</a> Ps 23</p>',
+])
+def test_nested_anchors(text):
+    assert _link(text) == text.replace('Ps 23', '<a href="19:23:0-19:23:6">Psalms 23</a>')
+
+
+def test_skip():
+    text = '<p><span>Joh 3:16</span> <code>Gen 1:1</code></p>'
+    s = Scriptures()
+    assert s.tag_scriptures(text, html=True) == '<p><span>{{Joh 3:16}}</span> <code>{{Gen 1:1}}</code></p>'
+    assert s.tag_scriptures(text, html=('code',)) == '<p><span>{{Joh 3:16}}</span> <code>Gen 1:1</code></p>'
+
+
+def test_reported_once(capsys):
+    text = '<p>Gen 99:1</p><p>Gen 99:1</p><div>Gen 99:1 <i>Joh</i> 3:16</div>'
+    _link(text, verbose=True)
+    assert capsys.readouterr().out.count('Gen 99:1') == 1
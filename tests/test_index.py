@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Citation index (documents citing a verse, most-cited verses)
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import pytest
+from linkture.index import CitationIndex
+
+
+@pytest.fixture
+def ix():
+    ix = CitationIndex()
+    ix.add_document('a', 'Joh 3:16-18; Gen 1:1')
+    ix.add_document('b', 'Joh 3:17; Ps 23')
+    ix.add_ranges('c', [('43003018', '43003020')])
+    yield ix
+    ix.close()
+
+
+def test_add(ix):
+    assert ix.add_document('d', 'Rev 22:21; Mt 5:3-5') == 2
+    assert ix.documents('Mt 5:4') == ['d']
+
+def test_edges(ix):
+    assert ix.documents('Joh 3:15') == []
+    assert sorted(ix.documents('Joh 3:15-16')) == ['a'] # (first verse)
+    assert sorted(ix.documents('Joh 3:18')) == ['a', 'c'] # (last verse of one, first of the other)
+    assert sorted(ix.documents('Joh 3:20-21')) == ['c']
+    assert ix.documents('Joh 3:21') == []
+    assert sorted(ix.documents(('43003017', '43003017'))) == ['a', 'b']
+    assert sorted(ix.documents([('01001001', '01001001'), ('19023006', '19023006')])) == ['a', 'b']
+
+def test_readd(ix):
+    assert ix.add_document('a', 'Rom 8:1') == 1 # (replaced)
+    assert ix.documents('Joh 3:16') == []
+    assert ix.documents('Rom 8:1') == ['a']
+    assert ix.top_verses(43) == [('43003017', 1), ('43003018', 1), ('43003019', 1), ('43003020', 1)]
+
+def test_remove(ix):
+    assert ix.top_verses(43) == [('43003017', 2), ('43003018', 2), ('43003016', 1), ('43003019', 1), ('43003020', 1)]
+    assert ix.top_verses(43, limit=1) == [('43003017', 2)]
+    assert ix.remove_document('a')
+    assert not ix.remove_document('a')
+    assert ix.top_verses(43) == [('43003017', 1), ('43003018', 1), ('43003019', 1), ('43003020', 1)]
+    assert ix.top_verses(1) == []
+    assert sorted(ix.documents('Joh 3:16-18')) == ['b', 'c']
+
+def test_out_of_range(ix):
+    assert ix.top_verses(67) == []
+
+def test_reopen(tmp_path):
+    path = tmp_path / 'citations.db'
+    ix = CitationIndex(path)
+    ix.add_document('a', 'Ps 23:1-3')
+    ix.add_document('b', 'Ps 23:2')
+    ix.close()
+    ix = CitationIndex(path)
+    assert ix.top_verses(19) == [('19023002', 2), ('19023001', 1), ('19023003', 1)]
+    assert sorted(ix.documents('Ps 23:2')) == ['a', 'b']
+    ix.remove_document('a')
+    ix.close()
+    ix = CitationIndex(path)
+    assert ix.top_verses(19) == [('19023002', 1)]
+    ix.close()
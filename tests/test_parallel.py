@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Parallel processing of a single document: same results as serial processing
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import random
+import pytest
+from linkture import Scriptures
+from linkture.parallel import methods, process_parallel
+
+
+_atoms = ('{{Gen 1:1}}', '{{Obadiah}}', '{{xy}}', '{{2 John 4}}', 'Gen', 'Ex', 'Mt', 'Joh', 'Jud', 'ab', 'a', 'x', '1', '2', '3', '12', ' ', ' ', '  ', ':', ',', ';', '.', '-', '–', '\n', '\n\n', 'Ps', 'I', 'II', '2nd', 'Sam', 'Cor', 'Rev', 'b', 'Song', '5', 'Gen 99:1', 'Mt 5:3-99', 'Ex 3:0', '1 John 9:1', '{{Ps 200}}', '2 Sam 99:1') # (reported in passes 1 and 2)
+_random = random.Random(1)
+_text = ''.join(_random.choice(_atoms) for _ in range(3000))
+_args = {'link_scriptures': ('[', ']'), 'tag_scriptures': ('<', '>'), 'code_scriptures': (True,)}
+_configs = (dict(translate='German'), dict(form='standard', upper=True))
+
+
+def _run(capsys, call):
+    capsys.readouterr()
+    result = call()
+    return result, capsys.readouterr().out # (error reports, in order)
+
+def _cases():
+    for method in methods:
+        for lines in (False, True):
+            for callback in (False, True):
+                if (lines or callback) and method not in ('list_scriptures', 'code_scriptures'):
+                    continue # (text methods only take a string, and return the text)
+                yield method, lines, callback
+
+
+@pytest.mark.parametrize('config', _configs, ids=('translate', 'upper'))
+@pytest.mark.parametrize('workers', (1, 2))
+@pytest.mark.parametrize('method, lines, callback', list(_cases()))
+def test_same_as_serial(capsys, monkeypatch, config, workers, method, lines, callback):
+    if lines: # several serial batches (see Scriptures._spans)
+        monkeypatch.setattr(Scriptures._spans, '__defaults__', (3000,))
+        monkeypatch.setattr('linkture.parallel._segments.__defaults__', (3000,))
+    args = _args.get(method, ())
+
+    def source():
+        return iter(_text.splitlines(True)) if lines else _text
+
+    def serial():
+        s = Scriptures(verbose=True, **config)
+        if callback:
+            records = []
+            getattr(s, method)(source(), *args, callback=records.append)
+            return records
+        return getattr(s, method)(source(), *args)
+
+    def parallel():
+        s = Scriptures(verbose=True, **config)
+        if callback:
+            records = []
+            process_parallel(s, source(), method, args, workers, size=700, callback=records.append)
+            return records
+        return process_parallel(s, source(), method, args, workers, size=700)
+
+    expected = _run(capsys, serial)
+    assert expected[1] # (there are error reports to compare)
+    assert _run(capsys, parallel) == expected
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        process_parallel(Scriptures(), _text, 'decode_scriptures')
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+  File:           linkture
+
+  Description:    Streamed BCV-range input and record output
+
+  MIT License:    Copyright (c) 2026 Eryk J.
+
+  Permission is hereby granted, free of charge, to any person obtaining a copy
+  of this software and associated documentation files (the "Software"), to deal
+  in the Software without restriction, including without limitation the rights
+  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+  copies of the Software, and to permit persons to whom the Software is
+  furnished to do so, subject to the following conditions:
+
+  The above copyright notice and this permission notice shall be included in all
+  copies or substantial portions of the Software.
+
+  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+  SOFTWARE.
+"""
+
+import io, struct, sys
+import pytest
+from linkture import Scriptures
+from linkture.__main__ import main_cli
+from linkture.streams import read_ranges
+
+_ranges = [('43003016', '43003016'), ('01001001', '01001003'), ('19023000', '19023006'), ('46013001', '46013013')] * 50
+_text = 'See Joh 3:16, 18; Gen 1:1-3 and Ps 23.\nRom 8:1; 1 Cor 13\n'
+
+
+@pytest.mark.parametrize('size', [1, 7, 64, 1048576])
+def test_repr_blocks(size):
+    # items straddling blocks are carried over to the next one
+    assert list(read_ranges(io.StringIO(repr(_ranges)), 'repr', size)) == _ranges
+    text = '[' + ', '.join(f'["{s}",{" " * 900}"{e}"]' for s, e in _ranges[:4]) + ']'
+    assert list(read_ranges(io.StringIO(text), 'repr', size)) == _ranges[:4]
+
+def test_repr_cap():
+    # an opening bracket followed by more than 1024 characters is not an item (unless within one block)
+    text = '(' + 'x' * 2000 + ") ('01001001', '01001002')"
+    assert list(read_ranges(io.StringIO(text), 'repr', 100)) == [('01001001', '01001002')]
+    assert list(read_ranges(io.StringIO(text), 'repr'))[1:] == [('01001001', '01001002')]
+    assert list(read_ranges(io.StringIO('[(), ( ), (1001001, 1001002)]'), 'repr')) == [('01001001', '01001002')]
+
+def test_jsonl():
+    text = '{"bcv_start": "01001001", "bcv_end": "01001002"}\n\n["43003016", 43003016]\nnot json\n5\n'
+    assert list(read_ranges(io.StringIO(text), 'jsonl')) == [
+        ('01001001', '01001002'), ('43003016', '43003016'), ('not json',), ('5',)]
+
+@pytest.mark.parametrize('size', [8, 12, 1048576])
+def test_bin(size):
+    data = b''.join(struct.pack('<II', int(s), int(e)) for s, e in _ranges)
+    assert list(read_ranges(io.BytesIO(data), 'bin', size)) == _ranges
+    assert list(read_ranges(io.BytesIO(data + b'\x01\x02\x03'), 'bin', size)) == _ranges + [('010203',)] # incomplete record
+
+@pytest.mark.parametrize('form, delimiter', [('csv', ','), ('tsv', '\t')])
+def test_csv(form, delimiter):
+    rows = ['bcv_start,bcv_end,reference', '1001001,01001003,"Genesis 1:1-3"', '', '43003016,43003016']
+    text = '\n'.join(rows).replace(',', delimiter) + '\n'
+    assert list(read_ranges(io.StringIO(text), form)) == [('01001001', '01001003'), ('43003016', '43003016')] # header skipped
+    assert list(read_ranges(io.StringIO('\n'.join(rows[1:]).replace(',', delimiter)), form)) == [
+        ('01001001', '01001003'), ('43003016', '43003016')] # (without a header)
+
+def test_invalid_format():
+    with pytest.raises(ValueError):
+        next(read_ranges(io.StringIO(''), 'xml'))
+
+@pytest.mark.parametrize('form', ['repr', 'jsonl', 'csv', 'tsv'])
+def test_round_trip(form, monkeypatch, tmp_path):
+    # -c --format X, then -d --in-format X
+    (tmp_path / 'in.txt').write_text(_text, encoding='UTF-8')
+    for args in (['-f', str(tmp_path / 'in.txt'), '-c', '--format', form, '-o', str(tmp_path / 'codes')],
+                 ['-f', str(tmp_path / 'codes'), '-d', '--in-format', form, '-o', str(tmp_path / 'out.txt')]):
+        monkeypatch.setattr(sys, 'argv', ['linkture'] + args)
+        main_cli()
+    s = Scriptures()
+    assert (tmp_path / 'out.txt').read_text(encoding='UTF-8') == repr(s.decode_scriptures(s.code_scriptures(_text)))
+
+def test_reversed(capsys):
+    # reversed ranges are reported when decoded (but not from text, where they are left as found)
+    s = Scriptures(verbose=True, form='full')
+    assert s.rewrite_scriptures('Joh 17:17-2; Gen 1:1') == 'Joh 17:17-2; Genesis 1:1'
+    assert capsys.readouterr().out == ''
+    assert s.decode_scriptures([('43017017', '43017002'), ('01001001', '01001001')]) == ['Genesis 1:1']
+    assert 'INVALID RANGE' in capsys.readouterr().out
+
+def test_empty():
+    s = Scriptures()
+    assert s.decode_scriptures() == []
+    assert s.decode_scriptures(None) == []
+    assert s.decode_scriptures(iter([])) == []